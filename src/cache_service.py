@@ -1,22 +1,195 @@
+import asyncio
+import atexit
+import heapq
 import os
 import json
 import logging
+import math
+import re
+import threading
 import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable, TypeVar, Generic, Union
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple, TypeVar, Generic, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, fall back to JSON lines
+    msgpack = None
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Compact the cache log once it holds this many records per live entry
+COMPACTION_RATIO = 4
+# ...but never for logs smaller than this
+COMPACTION_MIN_RECORDS = 64
+
+# Default bound on the number of in-memory cache entries
+DEFAULT_MAX_CACHE_SIZE = 10_000
+
+# Binary cache log when msgpack is installed, JSON lines otherwise
+DEFAULT_CACHE_FILE = 'tao-cache.msgpack' if msgpack is not None else 'tao-cache.jsonl'
+# Single JSON document cache file written by earlier versions
+LEGACY_CACHE_FILE = 'tao-cache.json'
+
+# Opening bracket and key of a JSON lines record
+_JSON_RECORD_KEY = re.compile(rb'\["(?:[^"\\]|\\.)*"')
+
+
+def _now_ms() -> int:
+    """Current wall-clock time in integer milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _monotonic_ms() -> int:
+    """Current monotonic time in integer milliseconds, unaffected by clock changes."""
+    return time.monotonic_ns() // 1_000_000
+
+
+def _clock_offset_ms() -> int:
+    """Offset converting monotonic times to wall-clock times."""
+    return _now_ms() - _monotonic_ms()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _encode_record(record: Any, binary: bool) -> bytes:
+    """Encode a single cache log record."""
+    if binary:
+        return msgpack.packb(record, use_bin_type=True)
+    return _dumps(record) + b'\n'
+
+
+class _EncodedData:
+    """Cache data read from the cache log and not decoded yet."""
+    __slots__ = ('raw', 'binary')
+
+    def __init__(self, raw: bytes, binary: bool):
+        self.raw = raw
+        self.binary = binary
+
+    def decode(self) -> Any:
+        """Decode the data."""
+        if self.binary:
+            return msgpack.unpackb(self.raw, raw=False, strict_map_key=False)
+        return _loads(self.raw)
+
+
+def _split_json_record(line: bytes) -> Any:
+    """
+    Decode a JSON lines record, leaving the data of entry records encoded.
+    Raises ValueError for torn or corrupt lines.
+    """
+    match = _JSON_RECORD_KEY.match(line)
+    if match is not None and line.endswith(b']\n'):
+        try:
+            head, timestamp, expires_at = line[:-2].rsplit(b',', 2)
+            timestamp, expires_at = int(timestamp), int(expires_at)
+        except ValueError:
+            pass
+        else:
+            key = _loads(match.group(0)[1:])
+            data = head[match.end():]
+            if not data:
+                return [key, timestamp, expires_at]
+            if data.startswith(b','):
+                return [key, _EncodedData(data[1:], False), timestamp, expires_at]
+    
+    # Headers, removals and anything unexpected are decoded in full
+    return _loads(line)
+
+
+def _split_binary_records(buf: bytes):
+    """Yield msgpack records, leaving the data of entry records encoded."""
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    unpacker.feed(buf)
+    try:
+        while unpacker.tell() < len(buf):
+            # Entry records are 4-item arrays
+            if buf[unpacker.tell()] == 0x94:
+                unpacker.read_array_header()
+                key = unpacker.unpack()
+                data_start = unpacker.tell()
+                unpacker.skip()
+                data = _EncodedData(buf[data_start:unpacker.tell()], True)
+                yield [key, data, unpacker.unpack(), unpacker.unpack()]
+            else:
+                yield unpacker.unpack()
+    except (msgpack.OutOfData, ValueError):
+        # Nothing after a torn or corrupt record can be framed again
+        return
+
+
+def _iter_records(f, binary: bool):
+    """
+    Yield the records of a cache log, skipping torn or corrupt ones.
+    The data of entry records is left encoded until it is accessed.
+    """
+    if binary:
+        yield from _split_binary_records(f.read())
+    else:
+        for line in f:
+            try:
+                yield _split_json_record(line)
+            except ValueError:
+                # Skip torn or corrupt lines (e.g. interrupted write)
+                continue
+
+
+def _encode_entry(key: str, entry: 'CacheEntry', binary: bool) -> bytes:
+    """Encode an entry record, copying data that was never decoded as is."""
+    raw = entry.encoded_data(binary)
+    if raw is None:
+        return _encode_record(entry.to_record(key), binary)
+    if binary:
+        return (b'\x94' + msgpack.packb(key, use_bin_type=True) + raw
+                + msgpack.packb(entry.timestamp) + msgpack.packb(entry.expires_at))
+    return b'[' + b','.join((_dumps(key), raw, _dumps(entry.timestamp), _dumps(entry.expires_at))) + b']\n'
+
 class CacheEntry(Generic[T]):
     """Class representing a cache entry with data and expiration time."""
-    def __init__(self, data: T, ttl: int):
-        self.data = data
-        self.timestamp = int(time.time() * 1000)  # milliseconds
+    __slots__ = ('_data', 'timestamp', 'expires_at')
+
+    def __init__(self, data: T, ttl: int, now_ms: Optional[int] = None):
+        self._data = data
+        self.timestamp = now_ms if now_ms is not None else _now_ms()  # milliseconds
         self.expires_at = self.timestamp + ttl
 
-    def is_expired(self) -> bool:
+    @property
+    def data(self) -> T:
+        """Cached data, decoded on first access when loaded from the cache log."""
+        if isinstance(self._data, _EncodedData):
+            self._data = self._data.decode()
+        return self._data
+
+    def encoded_data(self, binary: bool) -> Optional[bytes]:
+        """Data as read from a cache log in the given format, if not decoded yet."""
+        if isinstance(self._data, _EncodedData) and self._data.binary == binary:
+            return self._data.raw
+        return None
+
+    def is_expired(self, now_ms: Optional[int] = None) -> bool:
         """Check if this cache entry has expired."""
-        return int(time.time() * 1000) > self.expires_at
+        return (now_ms if now_ms is not None else _now_ms()) > self.expires_at
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -34,13 +207,139 @@ class CacheEntry(Generic[T]):
         entry.expires_at = data["expiresAt"]
         return entry
 
+    def to_record(self, key: str) -> List[Any]:
+        """Convert to a compact [key, data, timestamp, expiresAt] log record."""
+        return [key, self.data, self.timestamp, self.expires_at]
+
+    @classmethod
+    def from_record(cls, record: List[Any]) -> 'CacheEntry':
+        """Create a CacheEntry from a log record."""
+        entry = cls(record[1], 0)  # ttl is not used here
+        entry.timestamp = record[2]
+        entry.expires_at = record[3]
+        return entry
+
+
+class SlidingLogRateLimiter:
+    """Exact rate limiter keeping one timestamp per request in the window."""
+    def __init__(self, window_size_ms: int):
+        self.window_size_ms = window_size_ms
+        self.timestamps: Deque[int] = deque()
 
-class TaoStatsCacheService:
+    def _evict(self, now_ms: int) -> None:
+        """Drop timestamps older than the window."""
+        timestamps = self.timestamps
+        # Timestamps are appended in order, so expired ones are at the left
+        while timestamps and now_ms - timestamps[0] >= self.window_size_ms:
+            timestamps.popleft()
+
+    def count(self, now_ms: int) -> int:
+        """Number of requests made in the window ending now."""
+        self._evict(now_ms)
+        return len(self.timestamps)
+
+    def record(self, now_ms: int) -> None:
+        """Record a request."""
+        self.timestamps.append(now_ms)
+
+    def wait_time_ms(self, limit: int, now_ms: int) -> int:
+        """Time until the window has room for another request."""
+        count = self.count(now_ms)
+        if count < limit:
+            return 0
+        # The request that has to leave the window to free a slot
+        blocking_request = self.timestamps[count - limit] if limit > 0 else self.timestamps[-1]
+        return max(0, blocking_request + self.window_size_ms - now_ms)
+
+    def to_state(self, clock_offset_ms: int) -> Dict[str, Any]:
+        """State persisted in the cache log header, in wall-clock time."""
+        return {"requestTimestamps": [ts + clock_offset_ms for ts in self.timestamps]}
+
+    def load_state(self, state: Dict[str, Any], now_ms: int, clock_offset_ms: int) -> None:
+        """Restore state from a cache log header, dropping timestamps too old."""
+        if isinstance(state.get('requestTimestamps'), list):
+            self.timestamps = deque(sorted(
+                ts - clock_offset_ms for ts in state['requestTimestamps']
+                if now_ms - (ts - clock_offset_ms) < self.window_size_ms
+            ))
+
+
+class SlidingWindowCounterRateLimiter:
     """
-    Caching service for TaoStats API
-    Significantly reduces API calls by caching results
-    and implementing rate limiting per minute
+    Approximate rate limiter keeping two fixed-window counters.
+
+    The count for the window ending now is estimated by weighting the
+    previous window's count by how much of it still overlaps. This needs
+    constant memory, but the estimate can admit a few more requests than
+    the limit when they were bunched at the end of the previous window.
     """
+    def __init__(self, window_size_ms: int):
+        self.window_size_ms = window_size_ms
+        self.window_start = 0
+        self.prev_count = 0
+        self.curr_count = 0
+
+    def _roll(self, now_ms: int) -> int:
+        """Advance the fixed windows to now, returning the time elapsed in the current one."""
+        elapsed = now_ms - self.window_start
+        if elapsed >= self.window_size_ms:
+            windows = elapsed // self.window_size_ms
+            # Counts older than the previous window no longer matter
+            self.prev_count = self.curr_count if windows == 1 else 0
+            self.curr_count = 0
+            self.window_start += windows * self.window_size_ms
+            elapsed -= windows * self.window_size_ms
+        return max(0, elapsed)
+
+    def count(self, now_ms: int) -> int:
+        """Estimated number of requests made in the window ending now."""
+        elapsed = self._roll(now_ms)
+        overlap = 1 - elapsed / self.window_size_ms
+        return math.ceil(self.prev_count * overlap + self.curr_count)
+
+    def record(self, now_ms: int) -> None:
+        """Record a request."""
+        self._roll(now_ms)
+        self.curr_count += 1
+
+    def wait_time_ms(self, limit: int, now_ms: int) -> int:
+        """Time until the estimate drops below the limit."""
+        if limit <= 0:
+            return self.window_size_ms
+        elapsed = self._roll(now_ms)
+        # The estimate is rounded up, so it must drop to at most limit - 1
+        room = limit - 1 - self.curr_count
+        if room >= 0:
+            if self.prev_count <= room:
+                return 0
+            frees_at = math.ceil(self.window_size_ms * (1 - room / self.prev_count))
+            return max(0, frees_at - elapsed)
+        # The current window alone is over the limit, it has to become the previous one
+        frees_at = math.ceil(self.window_size_ms * (1 - (limit - 1) / self.curr_count))
+        return self.window_size_ms - elapsed + frees_at
+
+    def to_state(self, clock_offset_ms: int) -> Dict[str, Any]:
+        """State persisted in the cache log header, in wall-clock time."""
+        return {"rateWindow": [self.window_start + clock_offset_ms, self.prev_count, self.curr_count]}
+
+    def load_state(self, state: Dict[str, Any], now_ms: int, clock_offset_ms: int) -> None:
+        """Restore state from a cache log header."""
+        window = state.get('rateWindow')
+        if isinstance(window, list) and len(window) == 3:
+            window_start, self.prev_count, self.curr_count = window
+            self.window_start = window_start - clock_offset_ms
+            self._roll(now_ms)
+
+
+# Rate limiting strategies selectable with the rate_limit_strategy option
+RATE_LIMITERS = {
+    'sliding_log': SlidingLogRateLimiter,
+    'sliding_counter': SlidingWindowCounterRateLimiter
+}
+
+
+class _TaoStatsCacheBase:
+    """Cache storage, persistence and rate limiting shared by the TaoStats cache services."""
     
     def __init__(self, options: Dict[str, Any] = None):
         if options is None:
@@ -48,7 +347,9 @@ class TaoStatsCacheService:
             
         # Configure cache path
         self.cache_path = options.get('cache_path') or os.path.join(
-            os.getcwd(), '.cache', 'tao-cache.json')
+            os.getcwd(), '.cache', DEFAULT_CACHE_FILE)
+        # Log format follows the file extension
+        self._binary_log = msgpack is not None and self.cache_path.endswith('.msgpack')
         
         # Configure rate limits
         self.minute_request_limit = options.get('minute_request_limit', 5)
@@ -56,23 +357,53 @@ class TaoStatsCacheService:
         # Enable/disable persistent cache
         self.persistent_cache_enabled = options.get('persistent_cache_enabled', True)
         
+        # Bound the in-memory cache, least recently used entries are evicted first
+        self.max_cache_size = options.get('max_cache_size', DEFAULT_MAX_CACHE_SIZE)
+        
         # Initialize cache
-        self.cache: Dict[str, CacheEntry] = {}
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self.pending_requests: Dict[str, Any] = {}
-        self.request_timestamps: List[int] = []
         self.window_size_ms = 60 * 1000  # 1 minute window
         
+        # (expires_at, key) min-heap for sweeping expired entries. Entries that
+        # were refreshed or removed since leave stale items, skipped when popped
+        self._expiry_heap: List[Tuple[int, str]] = []
+        
+        # Configure rate limiting strategy
+        strategy = options.get('rate_limit_strategy', 'sliding_log')
+        if strategy not in RATE_LIMITERS:
+            raise ValueError(f'Unknown rate limit strategy: {strategy}')
+        self.rate_limiter = RATE_LIMITERS[strategy](self.window_size_ms)
+        
+        # Number of records currently in the append-only cache log
+        self._log_records = 0
+        
+        # Records not yet written to the cache log, flushed in the background
+        # every flush_interval seconds (0 writes them through immediately)
+        self.flush_interval = options.get('flush_interval', 5)
+        self._pending_records: List[bytes] = []
+        self._persist_lock = threading.RLock()
+        
         # Initialize cache from disk
         self._initialize_cache()
+        self._rebuild_expiry_heap()
         
-        # Handle shutdown properly
-        import atexit
-        atexit.register(self._persist_cache)
+        # Set by close() to stop the background flusher
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        
+        if self.persistent_cache_enabled:
+            if self.flush_interval > 0:
+                self._flusher = threading.Thread(target=self._flush_periodically, name='tao-cache-flush', daemon=True)
+                self._flusher.start()
+            
+            # Compact the cache log on shutdown, this also writes pending records
+            atexit.register(self.close)
     
     def _initialize_cache(self) -> None:
         """Initialize cache from persistent storage."""
         if not self.persistent_cache_enabled:
-            logging.info('TaoStats persistent cache is disabled')
+            logger.info('TaoStats persistent cache is disabled')
             return
         
         try:
@@ -80,93 +411,329 @@ class TaoStatsCacheService:
             cache_dir = os.path.dirname(self.cache_path)
             Path(cache_dir).mkdir(parents=True, exist_ok=True)
             
-            # Try to load existing cache
+            # Try to load existing cache log
+            now = _now_ms()
             try:
-                with open(self.cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                # Restore request timestamps, but filter those too old
-                if 'requestTimestamps' in cache_data and isinstance(cache_data['requestTimestamps'], list):
-                    now = int(time.time() * 1000)
-                    self.request_timestamps = [
-                        ts for ts in cache_data['requestTimestamps']
-                        if now - ts < self.window_size_ms
-                    ]
+                entries: Dict[str, Optional[List[Any]]] = {}
+                with open(self.cache_path, 'rb') as f:
+                    for record in _iter_records(f, self._binary_log):
+                        self._log_records += 1
+                        
+                        # Header written on compaction
+                        if isinstance(record, dict):
+                            # Restore rate limiting state
+                            self.rate_limiter.load_state(record, _monotonic_ms(), _clock_offset_ms())
+                        # Entry record, [key, timestamp, expiresAt] for a refreshed
+                        # entry with unchanged data, or a bare [key] for invalidated keys
+                        elif isinstance(record, list) and record:
+                            key = record[0]
+                            # Last write wins
+                            previous = entries.pop(key, None)
+                            if len(record) == 3:
+                                record = [key, previous[1], record[1], record[2]] if previous else None
+                            entries[key] = record if record and len(record) == 4 else None
                 
                 # Restore cache entries
-                if 'entries' in cache_data and isinstance(cache_data['entries'], list):
-                    for entry in cache_data['entries']:
-                        if isinstance(entry, list) and len(entry) == 2:
-                            key, value = entry
-                            # Only restore non-expired entries
-                            cache_entry = CacheEntry.from_dict(value)
-                            if not cache_entry.is_expired():
-                                self.cache[key] = cache_entry
+                for key, record in entries.items():
+                    if record is None:
+                        continue
+                    # Only restore non-expired entries
+                    cache_entry = CacheEntry.from_record(record)
+                    if not cache_entry.is_expired(now):
+                        self.cache[key] = cache_entry
+                self._evict_overflow()
                 
-                logging.info(f'Loaded TaoStats cache with {len(self.cache)} entries')
+                logger.info('Loaded TaoStats cache with %d entries', len(self.cache))
             
-            except (FileNotFoundError, json.JSONDecodeError):
-                logging.info('No valid TaoStats cache found, starting with empty cache')
+            except FileNotFoundError:
+                self._import_legacy_cache()
         
         except Exception as e:
-            logging.error(f'Error initializing TaoStats cache: {e}')
+            logger.error('Error initializing TaoStats cache: %s', e)
+    
+    def _import_legacy_cache(self) -> None:
+        """Import entries from a cache file written in the legacy JSON format."""
+        legacy_path = os.path.join(os.path.dirname(self.cache_path), LEGACY_CACHE_FILE)
+        if legacy_path == self.cache_path or not os.path.exists(legacy_path):
+            logger.info('No valid TaoStats cache found, starting with empty cache')
+            return
+        
+        try:
+            with open(legacy_path, 'rb') as f:
+                cache_data = _loads(f.read())
+            
+            now = _now_ms()
+            for item in cache_data.get('entries', []):
+                if isinstance(item, list) and len(item) == 2:
+                    key, value = item
+                    # Only import non-expired entries
+                    cache_entry = CacheEntry.from_dict(value)
+                    if not cache_entry.is_expired(now):
+                        self.cache[key] = cache_entry
+            self._evict_overflow()
+            
+            # Write the imported entries in the current format
+            self._compact()
+            logger.info('Imported %d entries from legacy TaoStats cache', len(self.cache))
+        
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.info('No valid TaoStats cache found, starting with empty cache')
     
-    def _persist_cache(self) -> None:
-        """Save cache to persistent storage."""
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get a cache entry, decoding its data if it was loaded lazily."""
+        entry = self.cache.get(key)
+        if entry is not None:
+            try:
+                entry.data
+            except Exception as e:
+                logger.warning('Dropping unreadable TaoStats cache entry %s: %s', key, e)
+                del self.cache[key]
+                return None
+        return entry
+    
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry as the most recently used one."""
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        self._evict_overflow()
+        
+        heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+        # Drop stale items once they outnumber the live ones
+        if len(self._expiry_heap) > 2 * len(self.cache) + COMPACTION_MIN_RECORDS:
+            self._rebuild_expiry_heap()
+    
+    def _rebuild_expiry_heap(self) -> None:
+        """Rebuild the expiry heap from the live entries."""
+        self._expiry_heap = [(entry.expires_at, key) for key, entry in self.cache.items()]
+        heapq.heapify(self._expiry_heap)
+    
+    def sweep_expired(self, now_ms: Optional[int] = None) -> int:
+        """
+        Remove expired entries, visiting only those whose expiry has passed.
+        Expired entries are otherwise kept as a fallback when the API is
+        rate limited or failing, so this is not done automatically.
+        """
+        now = now_ms if now_ms is not None else _now_ms()
+        heap = self._expiry_heap
+        count = 0
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Skip items for entries refreshed or removed since
+            if entry is not None and entry.expires_at == expires_at:
+                del self.cache[key]
+                count += 1
+        
+        # Expired entries are not restored from the cache log, no removal records needed
+        logger.debug('Swept %d expired TaoStats cache entries', count)
+        return count
+    
+    def _evict_overflow(self) -> None:
+        """Evict least recently used entries above max_cache_size."""
+        evicted = 0
+        while len(self.cache) > self.max_cache_size:
+            self.cache.popitem(last=False)
+            evicted += 1
+        
+        if evicted:
+            logger.debug('Evicted %d least recently used TaoStats cache entries', evicted)
+    
+    def _append_entry(self, key: str, entry: Optional[CacheEntry], data_changed: bool = True) -> None:
+        """
+        Queue a single entry (or a removal when entry is None) for the cache log.
+        Entries whose data did not change are logged without it.
+        """
         if not self.persistent_cache_enabled:
             return
         
         try:
-            # Create cache structure
-            cache_data = {
-                "timestamp": int(time.time() * 1000),
-                "requestTimestamps": self.request_timestamps,
-                "entries": [[key, entry.to_dict()] for key, entry in self.cache.items()]
-            }
+            if entry is None:
+                record = [key]
+            elif data_changed:
+                record = entry.to_record(key)
+            else:
+                record = [key, entry.timestamp, entry.expires_at]
+            encoded = _encode_record(record, self._binary_log)
+        except Exception as e:
+            logger.error('Failed to persist TaoStats cache: %s', e)
+            return
+        
+        with self._persist_lock:
+            self._pending_records.append(encoded)
+        
+        if self.flush_interval <= 0:
+            self.flush()
+        
+        # Rewrite the log once it holds mostly superseded records. This runs on
+        # the thread updating the cache, so the entries cannot change while
+        # they are written, the flusher thread only appends records
+        if self._log_records + len(self._pending_records) > max(COMPACTION_RATIO * len(self.cache),
+                                                                COMPACTION_MIN_RECORDS):
+            self._compact()
+    
+    def _open_in_cache_dir(self, path: str, mode: str):
+        """
+        Open a file in the cache directory, created when the cache is initialized.
+        The directory is only created again if it was removed since.
+        """
+        try:
+            return open(path, mode)
+        except FileNotFoundError:
+            Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+            return open(path, mode)
+    
+    def _flush_periodically(self) -> None:
+        """Flush pending records every flush_interval seconds, until the cache is closed."""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self) -> None:
+        """Stop the background flusher and compact the cache log, writing pending records."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self._compact()
+        atexit.unregister(self.close)
+    
+    def flush(self) -> None:
+        """Append pending records to the cache log."""
+        with self._persist_lock:
+            if not self._pending_records:
+                return
             
-            # Ensure directory exists
-            cache_dir = os.path.dirname(self.cache_path)
-            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            try:
+                with self._open_in_cache_dir(self.cache_path, 'ab') as f:
+                    f.write(b''.join(self._pending_records))
+                self._log_records += len(self._pending_records)
+                self._pending_records = []
             
-            # Write cache to file
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            except Exception as e:
+                logger.error('Failed to persist TaoStats cache: %s', e)
+    
+    def _compact(self) -> None:
+        """Rewrite the cache log with only the live entries."""
+        if not self.persistent_cache_enabled:
+            return
+        
+        try:
+            # Header record followed by one record per entry
+            header = {
+                "timestamp": _now_ms(),
+                **self.rate_limiter.to_state(_clock_offset_ms())
+            }
             
-            logging.debug(f'TaoStats cache persisted with {len(self.cache)} entries')
+            with self._persist_lock:
+                # Snapshot the entries, lookups may add more while writing
+                entries = list(self.cache.items())
+                
+                # Write to a temporary file and swap it in, so an interrupted
+                # compaction never leaves a truncated log behind
+                tmp_path = self.cache_path + '.tmp'
+                try:
+                    with self._open_in_cache_dir(tmp_path, 'wb') as f:
+                        f.write(_encode_record(header, self._binary_log))
+                        for key, entry in entries:
+                            f.write(_encode_entry(key, entry, self._binary_log))
+                    os.replace(tmp_path, self.cache_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                
+                # The new log supersedes all pending records
+                self._pending_records = []
+                self._log_records = len(entries) + 1
+            
+            logger.debug('TaoStats cache compacted with %d entries', len(entries))
         
         except Exception as e:
-            logging.error(f'Failed to persist TaoStats cache: {e}')
+            logger.error('Failed to persist TaoStats cache: %s', e)
     
-    def _cleanup_expired_timestamps(self) -> None:
-        """Clean up expired request timestamps (older than window)."""
-        now = int(time.time() * 1000)
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps
-            if now - ts < self.window_size_ms
-        ]
+    def _request_count(self, now_ms: Optional[int] = None) -> int:
+        """Number of requests made in the current window."""
+        return self.rate_limiter.count(now_ms if now_ms is not None else _monotonic_ms())
     
-    def _has_reached_rate_limit(self) -> bool:
+    def _has_reached_rate_limit(self, now_ms: Optional[int] = None) -> bool:
         """Check if we've reached the rate limit."""
-        self._cleanup_expired_timestamps()
-        return len(self.request_timestamps) >= self.minute_request_limit
+        return self._request_count(now_ms) >= self.minute_request_limit
     
-    def _record_request(self) -> None:
-        """Record a request timestamp."""
-        self.request_timestamps.append(int(time.time() * 1000))
+    def _record_request(self, now_ms: Optional[int] = None) -> None:
+        """Record a request for rate tracking."""
+        self.rate_limiter.record(now_ms if now_ms is not None else _monotonic_ms())
     
-    def _get_wait_time_ms(self) -> int:
+    def record_retry(self, now_ms: Optional[int] = None) -> bool:
+        """Record a retried API request for rate tracking, unless the rate limit is reached.
+        
+        Retries are sent outside with_cache, so they are counted here.
+        
+        Returns:
+            Whether the retry may be sent
+        """
+        now = now_ms if now_ms is not None else _monotonic_ms()
+        if self._has_reached_rate_limit(now):
+            return False
+        self._record_request(now)
+        return True
+    
+    def _get_wait_time_ms(self, now_ms: Optional[int] = None) -> int:
         """Calculate wait time before next request can be made."""
-        if not self.request_timestamps:
-            return 0
+        now = now_ms if now_ms is not None else _monotonic_ms()
+        return self.rate_limiter.wait_time_ms(self.minute_request_limit, now)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get statistics about the current cache state."""
+        now = _monotonic_ms()
+        request_count = self._request_count(now)
+        
+        # Calculate time until a request is possible again
+        window_reset_time = 'N/A'
+        if request_count >= self.minute_request_limit:
+            wait_time = self._get_wait_time_ms(now)
+            window_reset_time = f'{wait_time // 1000} seconds'
+        else:
+            window_reset_time = 'Available now'
         
-        now = int(time.time() * 1000)
-        # Sort timestamps to get the oldest
-        sorted_timestamps = sorted(self.request_timestamps)
-        oldest_request = sorted_timestamps[0]
+        return {
+            'size': len(self.cache),
+            'current_minute_requests': request_count,
+            'api_calls_remaining': max(0, self.minute_request_limit - request_count),
+            'window_reset_time': window_reset_time
+        }
+    
+    def invalidate(self, key: str) -> None:
+        """Clear a specific cache entry."""
+        if key in self.cache:
+            del self.cache[key]
+            self._append_entry(key, None)
+            logger.debug('Cache entry invalidated: %s', key)
+    
+    def invalidate_by_prefix(self, prefix: str) -> int:
+        """Clear all entries matching a prefix."""
+        # Only the matching keys are copied, to allow deleting while iterating
+        matching_keys = [key for key in self.cache if key.startswith(prefix)]
+        for key in matching_keys:
+            del self.cache[key]
+            self._append_entry(key, None)
         
-        # Calculate when we can make a new request
-        time_until_window_frees = (oldest_request + self.window_size_ms) - now
-        return max(0, time_until_window_frees)
+        logger.debug('Invalidated %d cache entries with prefix: %s', len(matching_keys), prefix)
+        return len(matching_keys)
+    
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        self.cache.clear()
+        self._expiry_heap = []
+        self._compact()
+        logger.info('TaoStats cache cleared')
+
+
+class TaoStatsCacheService(_TaoStatsCacheBase):
+    """
+    Caching service for TaoStats API
+    Significantly reduces API calls by caching results
+    and implementing rate limiting per minute
+    """
     
     async def with_cache(self, 
                          key: str,
@@ -198,256 +765,99 @@ class TaoStatsCacheService:
         critical = options.get('critical', False)
         fail_silently = options.get('fail_silently', False)
         
+        # Read the wall clock once for the expiry checks below
+        now = _now_ms()
+        
         try:
             # Check if we already have a pending request for this key
             if key in self.pending_requests and not force_refresh:
-                logging.debug(f'Using pending request for key: {key}')
-                return await self.pending_requests[key]
+                logger.debug('Using pending request for key: %s', key)
+                return await asyncio.shield(self.pending_requests[key])
             
             # Check if we have a valid cache entry
-            cached_entry = self.cache.get(key)
-            if cached_entry and not force_refresh and not cached_entry.is_expired():
-                logging.debug(f'Cache hit for key: {key}')
+            cached_entry = self._get_entry(key)
+            if cached_entry and not force_refresh and not cached_entry.is_expired(now):
+                logger.debug('Cache hit for key: %s', key)
+                self.cache.move_to_end(key)
                 return cached_entry.data
             
-            # Check if we've reached the rate limit
-            if self._has_reached_rate_limit() and not critical:
+            # Check if we've reached the rate limit, the window runs on the monotonic clock
+            rate_now = _monotonic_ms()
+            if self._has_reached_rate_limit(rate_now) and not critical:
                 # If we have a cache entry, even expired, use it
                 if cached_entry and fallback_to_cache:
-                    wait_time = self._get_wait_time_ms()
-                    logging.warning(
-                        f'API rate limit reached ({len(self.request_timestamps)}/{self.minute_request_limit} per minute), '
-                        f'wait time: {wait_time // 1000}s, using expired cache for: {key}'
+                    wait_time = self._get_wait_time_ms(rate_now)
+                    logger.warning(
+                        'API rate limit reached (%d/%d per minute), wait time: %ds, using expired cache for: %s',
+                        self._request_count(rate_now), self.minute_request_limit, wait_time // 1000, key
                     )
                     return cached_entry.data
                 
                 # Otherwise, raise an error or return None based on fail_silently
-                wait_time = self._get_wait_time_ms()
+                wait_time = self._get_wait_time_ms(rate_now)
                 message = (
-                    f'TaoStats API rate limit reached ({len(self.request_timestamps)}/{self.minute_request_limit} per minute), '
+                    f'TaoStats API rate limit reached ({self._request_count(rate_now)}/{self.minute_request_limit} per minute), '
                     f'need to wait {wait_time // 1000} seconds'
                 )
                 
                 if fail_silently:
-                    logging.warning(f'{message}, returning None for: {key}')
+                    logger.warning('%s, returning None for: %s', message, key)
                     return None
                 else:
                     raise Exception(message)
             
-            # Create a promise for the request
+            # Record the request for rate tracking before yielding to the event loop,
+            # so concurrent lookups see it when checking the rate limit
+            self._record_request(rate_now)
+            
+            # Create a task for the request
             async def execute_fetch():
                 try:
-                    # Record the request for rate tracking
-                    self._record_request()
-                    
                     # Make the actual API request
-                    logging.info(
-                        f'TaoStats API request ({len(self.request_timestamps)}/{self.minute_request_limit} per minute) for: {key}'
+                    logger.info(
+                        'TaoStats API request (%d/%d per minute) for: %s',
+                        self._request_count(), self.minute_request_limit, key
                     )
                     result = await fetch_fn()
                     
                     # Update the cache
-                    self.cache[key] = CacheEntry(result, ttl)
+                    entry = CacheEntry(result, ttl)
+                    self._store(key, entry)
                     
-                    # Persist the cache after each new result
-                    self._persist_cache()
+                    # Append the new result to the cache log, without the data if unchanged
+                    self._append_entry(key, entry, cached_entry is None or cached_entry.data != result)
                     
                     return result
                 except Exception as error:
                     # If a cache entry exists, use it even if expired
                     if fallback_to_cache and cached_entry:
-                        logging.warning(f'Error fetching {key}, falling back to cache: {error}')
+                        logger.warning('Error fetching %s, falling back to cache: %s', key, error)
                         return cached_entry.data
                     
                     # Otherwise, propagate the error
                     raise
                 finally:
-                    # Clean up the pending request
-                    if key in self.pending_requests:
+                    # Clean up the pending request, unless a forced refresh replaced it
+                    if self.pending_requests.get(key) is asyncio.current_task():
                         del self.pending_requests[key]
             
-            # Register the promise to avoid duplicate requests
-            fetch_promise = execute_fetch()
-            self.pending_requests[key] = fetch_promise
+            # Register the task so concurrent lookups for this key share its result.
+            # Nothing above awaits, so no other lookup can run between the checks
+            # and this registration.
+            fetch_task = asyncio.ensure_future(execute_fetch())
+            self.pending_requests[key] = fetch_task
             
-            return await fetch_promise
+            # Shield the shared task from the cancellation of a single caller
+            return await asyncio.shield(fetch_task)
         
         except Exception as error:
-            logging.error(f'Cache error for key {key}: {error}')
+            logger.error('Cache error for key %s: %s', key, error)
             raise
-    
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get statistics about the current cache state."""
-        # Clean up expired timestamps first
-        self._cleanup_expired_timestamps()
-        
-        # Calculate time until a request is possible again
-        window_reset_time = 'N/A'
-        if self.request_timestamps and len(self.request_timestamps) >= self.minute_request_limit:
-            wait_time = self._get_wait_time_ms()
-            window_reset_time = f'{wait_time // 1000} seconds'
-        else:
-            window_reset_time = 'Available now'
-        
-        return {
-            'size': len(self.cache),
-            'current_minute_requests': len(self.request_timestamps),
-            'api_calls_remaining': max(0, self.minute_request_limit - len(self.request_timestamps)),
-            'window_reset_time': window_reset_time
-        }
-    
-    def invalidate(self, key: str) -> None:
-        """Clear a specific cache entry."""
-        if key in self.cache:
-            del self.cache[key]
-            logging.debug(f'Cache entry invalidated: {key}')
-    
-    def invalidate_by_prefix(self, prefix: str) -> int:
-        """Clear all entries matching a prefix."""
-        count = 0
-        for key in list(self.cache.keys()):
-            if key.startswith(prefix):
-                del self.cache[key]
-                count += 1
-        
-        logging.debug(f'Invalidated {count} cache entries with prefix: {prefix}')
-        return count
-    
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        self.cache.clear()
-        logging.info('TaoStats cache cleared')
 
 
 # Create a synchronous version for easier integration with existing code
-class SyncTaoStatsCacheService:
-    """Synchronous wrapper around TaoStatsCacheService for non-async code."""
-    
-    def __init__(self, options: Dict[str, Any] = None):
-        if options is None:
-            options = {}
-        
-        # Configure cache path
-        self.cache_path = options.get('cache_path') or os.path.join(
-            os.getcwd(), '.cache', 'tao-cache.json')
-        
-        # Configure rate limits
-        self.minute_request_limit = options.get('minute_request_limit', 5)
-        
-        # Enable/disable persistent cache
-        self.persistent_cache_enabled = options.get('persistent_cache_enabled', True)
-        
-        # Initialize cache
-        self.cache: Dict[str, CacheEntry] = {}
-        self.pending_requests: Dict[str, bool] = {}
-        self.request_timestamps: List[int] = []
-        self.window_size_ms = 60 * 1000  # 1 minute window
-        
-        # Initialize cache from disk
-        self._initialize_cache()
-        
-        # Handle shutdown properly
-        import atexit
-        atexit.register(self._persist_cache)
-    
-    def _initialize_cache(self) -> None:
-        """Initialize cache from persistent storage."""
-        if not self.persistent_cache_enabled:
-            logging.info('TaoStats persistent cache is disabled')
-            return
-        
-        try:
-            # Check if cache directory exists
-            cache_dir = os.path.dirname(self.cache_path)
-            Path(cache_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Try to load existing cache
-            try:
-                with open(self.cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                # Restore request timestamps, but filter those too old
-                if 'requestTimestamps' in cache_data and isinstance(cache_data['requestTimestamps'], list):
-                    now = int(time.time() * 1000)
-                    self.request_timestamps = [
-                        ts for ts in cache_data['requestTimestamps']
-                        if now - ts < self.window_size_ms
-                    ]
-                
-                # Restore cache entries
-                if 'entries' in cache_data and isinstance(cache_data['entries'], list):
-                    for entry in cache_data['entries']:
-                        if isinstance(entry, list) and len(entry) == 2:
-                            key, value = entry
-                            # Only restore non-expired entries
-                            cache_entry = CacheEntry.from_dict(value)
-                            if not cache_entry.is_expired():
-                                self.cache[key] = cache_entry
-                
-                logging.info(f'Loaded TaoStats cache with {len(self.cache)} entries')
-            
-            except (FileNotFoundError, json.JSONDecodeError):
-                logging.info('No valid TaoStats cache found, starting with empty cache')
-        
-        except Exception as e:
-            logging.error(f'Error initializing TaoStats cache: {e}')
-    
-    def _persist_cache(self) -> None:
-        """Save cache to persistent storage."""
-        if not self.persistent_cache_enabled:
-            return
-        
-        try:
-            # Create cache structure
-            cache_data = {
-                "timestamp": int(time.time() * 1000),
-                "requestTimestamps": self.request_timestamps,
-                "entries": [[key, entry.to_dict()] for key, entry in self.cache.items()]
-            }
-            
-            # Ensure directory exists
-            cache_dir = os.path.dirname(self.cache_path)
-            Path(cache_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Write cache to file
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
-            
-            logging.debug(f'TaoStats cache persisted with {len(self.cache)} entries')
-        
-        except Exception as e:
-            logging.error(f'Failed to persist TaoStats cache: {e}')
-    
-    def _cleanup_expired_timestamps(self) -> None:
-        """Clean up expired request timestamps (older than window)."""
-        now = int(time.time() * 1000)
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps
-            if now - ts < self.window_size_ms
-        ]
-    
-    def _has_reached_rate_limit(self) -> bool:
-        """Check if we've reached the rate limit."""
-        self._cleanup_expired_timestamps()
-        return len(self.request_timestamps) >= self.minute_request_limit
-    
-    def _record_request(self) -> None:
-        """Record a request timestamp."""
-        self.request_timestamps.append(int(time.time() * 1000))
-    
-    def _get_wait_time_ms(self) -> int:
-        """Calculate wait time before next request can be made."""
-        if not self.request_timestamps:
-            return 0
-        
-        now = int(time.time() * 1000)
-        # Sort timestamps to get the oldest
-        sorted_timestamps = sorted(self.request_timestamps)
-        oldest_request = sorted_timestamps[0]
-        
-        # Calculate when we can make a new request
-        time_until_window_frees = (oldest_request + self.window_size_ms) - now
-        return max(0, time_until_window_frees)
+class SyncTaoStatsCacheService(_TaoStatsCacheBase):
+    """Synchronous version of TaoStatsCacheService for non-async code."""
     
     def with_cache(self, 
                    key: str,
@@ -479,38 +889,43 @@ class SyncTaoStatsCacheService:
         critical = options.get('critical', False)
         fail_silently = options.get('fail_silently', False)
         
+        # Read the wall clock once for the expiry checks below
+        now = _now_ms()
+        
         try:
             # Check if we already have a pending request for this key
             if key in self.pending_requests and not force_refresh:
-                logging.debug(f'Using pending request for key: {key}')
+                logger.debug('Using pending request for key: %s', key)
                 return None  # Can't wait for pending requests in sync mode
             
             # Check if we have a valid cache entry
-            cached_entry = self.cache.get(key)
-            if cached_entry and not force_refresh and not cached_entry.is_expired():
-                logging.debug(f'Cache hit for key: {key}')
+            cached_entry = self._get_entry(key)
+            if cached_entry and not force_refresh and not cached_entry.is_expired(now):
+                logger.debug('Cache hit for key: %s', key)
+                self.cache.move_to_end(key)
                 return cached_entry.data
             
-            # Check if we've reached the rate limit
-            if self._has_reached_rate_limit() and not critical:
+            # Check if we've reached the rate limit, the window runs on the monotonic clock
+            rate_now = _monotonic_ms()
+            if self._has_reached_rate_limit(rate_now) and not critical:
                 # If we have a cache entry, even expired, use it
                 if cached_entry and fallback_to_cache:
-                    wait_time = self._get_wait_time_ms()
-                    logging.warning(
-                        f'API rate limit reached ({len(self.request_timestamps)}/{self.minute_request_limit} per minute), '
-                        f'wait time: {wait_time // 1000}s, using expired cache for: {key}'
+                    wait_time = self._get_wait_time_ms(rate_now)
+                    logger.warning(
+                        'API rate limit reached (%d/%d per minute), wait time: %ds, using expired cache for: %s',
+                        self._request_count(rate_now), self.minute_request_limit, wait_time // 1000, key
                     )
                     return cached_entry.data
                 
                 # Otherwise, raise an error or return None based on fail_silently
-                wait_time = self._get_wait_time_ms()
+                wait_time = self._get_wait_time_ms(rate_now)
                 message = (
-                    f'TaoStats API rate limit reached ({len(self.request_timestamps)}/{self.minute_request_limit} per minute), '
+                    f'TaoStats API rate limit reached ({self._request_count(rate_now)}/{self.minute_request_limit} per minute), '
                     f'need to wait {wait_time // 1000} seconds'
                 )
                 
                 if fail_silently:
-                    logging.warning(f'{message}, returning None for: {key}')
+                    logger.warning('%s, returning None for: %s', message, key)
                     return None
                 else:
                     raise Exception(message)
@@ -520,25 +935,27 @@ class SyncTaoStatsCacheService:
             
             try:
                 # Record the request for rate tracking
-                self._record_request()
+                self._record_request(rate_now)
                 
                 # Make the actual API request
-                logging.info(
-                    f'TaoStats API request ({len(self.request_timestamps)}/{self.minute_request_limit} per minute) for: {key}'
+                logger.info(
+                    'TaoStats API request (%d/%d per minute) for: %s',
+                    self._request_count(), self.minute_request_limit, key
                 )
                 result = fetch_fn()
                 
                 # Update the cache
-                self.cache[key] = CacheEntry(result, ttl)
+                entry = CacheEntry(result, ttl)
+                self._store(key, entry)
                 
-                # Persist the cache after each new result
-                self._persist_cache()
+                # Append the new result to the cache log, without the data if unchanged
+                self._append_entry(key, entry, cached_entry is None or cached_entry.data != result)
                 
                 return result
             except Exception as error:
                 # If a cache entry exists, use it even if expired
                 if fallback_to_cache and cached_entry:
-                    logging.warning(f'Error fetching {key}, falling back to cache: {error}')
+                    logger.warning('Error fetching %s, falling back to cache: %s', key, error)
                     return cached_entry.data
                 
                 # Otherwise, propagate the error
@@ -549,52 +966,11 @@ class SyncTaoStatsCacheService:
                     del self.pending_requests[key]
         
         except Exception as error:
-            logging.error(f'Cache error for key {key}: {error}')
+            logger.error('Cache error for key %s: %s', key, error)
             raise
-    
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get statistics about the current cache state."""
-        # Clean up expired timestamps first
-        self._cleanup_expired_timestamps()
-        
-        # Calculate time until a request is possible again
-        window_reset_time = 'N/A'
-        if self.request_timestamps and len(self.request_timestamps) >= self.minute_request_limit:
-            wait_time = self._get_wait_time_ms()
-            window_reset_time = f'{wait_time // 1000} seconds'
-        else:
-            window_reset_time = 'Available now'
-        
-        return {
-            'size': len(self.cache),
-            'current_minute_requests': len(self.request_timestamps),
-            'api_calls_remaining': max(0, self.minute_request_limit - len(self.request_timestamps)),
-            'window_reset_time': window_reset_time
-        }
-    
-    def invalidate(self, key: str) -> None:
-        """Clear a specific cache entry."""
-        if key in self.cache:
-            del self.cache[key]
-            logging.debug(f'Cache entry invalidated: {key}')
-    
-    def invalidate_by_prefix(self, prefix: str) -> int:
-        """Clear all entries matching a prefix."""
-        count = 0
-        for key in list(self.cache.keys()):
-            if key.startswith(prefix):
-                del self.cache[key]
-                count += 1
-        
-        logging.debug(f'Invalidated {count} cache entries with prefix: {prefix}')
-        return count
-    
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        self.cache.clear()
-        logging.info('TaoStats cache cleared')
+
 
 # Export a singleton instance
-tao_stats_cache = SyncTaoStatsCacheService({
+tao_stats_cache = TaoStatsCacheService({
     'minute_request_limit': int(os.getenv('TAO_STAT_MINUTE_LIMIT', '5'))
 }) 
\ No newline at end of file
@@ -1,74 +1,197 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Dict, List, Optional, Union, Any, Literal
+import re
+from array import array
+from decimal import Decimal
+from functools import lru_cache
+from pydantic import (AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, NonNegativeInt,
+                      PlainSerializer, PlainValidator, PositiveFloat, TypeAdapter, ValidationError,
+                      ValidationInfo, model_validator)
+from pydantic.dataclasses import dataclass
+from pydantic_core import PydanticUndefined
+from typing import Annotated, Dict, List, Optional, TypeVar, Union, Any, Literal
 from datetime import datetime
 
+# Substrate generic (prefix 42) SS58 address, base58 encoded
+_SS58_RE = re.compile(r'^5[1-9A-HJ-NP-Za-km-z]{47}$')
+# 20 byte EVM address
+_EVM_RE = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+
+def _is_trusted(info: ValidationInfo) -> bool:
+    """Whether the data comes from a trusted source, e.g. our own indexer."""
+    return bool(info.context and info.context.get('trusted'))
+
+
+def _check_ss58(v: str, info: ValidationInfo) -> str:
+    if not _is_trusted(info) and not _SS58_RE.match(v):
+        raise ValueError('Invalid SS58 address format')
+    return v
+
+
+def _check_evm(v: str, info: ValidationInfo) -> str:
+    if not _is_trusted(info) and not _EVM_RE.match(v):
+        raise ValueError('Invalid Ethereum address format')
+    return v
+
+
+def _check_hex(v: str, info: ValidationInfo) -> str:
+    if not _is_trusted(info) and not v.startswith('0x'):
+        raise ValueError('Invalid hex address format')
+    return v
+
+
+# Address types share one validator each instead of per-model field validators.
+# The format checks are skipped when validating with context={'trusted': True}
+SS58Address = Annotated[str, AfterValidator(_check_ss58)]
+EVMAddress = Annotated[str, AfterValidator(_check_evm)]
+HexAddress = Annotated[str, AfterValidator(_check_hex)]
+
+T = TypeVar('T')
+
+# Token amounts, kept exact
+NonNegativeDecimal = Annotated[Decimal, Field(ge=0)]
+# Balances in the smallest unit, sent as decimal integer strings
+Wei = NonNegativeInt
+
+
+def _parse_hex_bytes(v: Any) -> Any:
+    if isinstance(v, str):
+        try:
+            return bytes.fromhex(v.removeprefix('0x'))
+        except ValueError:
+            raise ValueError('Invalid hex data') from None
+    return v
+
+
+# 0x-prefixed hex data, stored as bytes and serialized back to hex
+HexBytes = Annotated[bytes, BeforeValidator(_parse_hex_bytes),
+                     PlainSerializer(lambda v: '0x' + v.hex(), return_type=str, when_used='json')]
+# Free-form JSON passed through as is, its contents are not validated
+OpaqueJson = Any
+
+
+def _column(typecode: str, cast: Any):
+    def parse(v: Any) -> array:
+        try:
+            return array(typecode, map(cast, v))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f'Invalid numeric column: {e}') from e
+    return parse
+
+
+# Chart series are stored as packed C arrays rather than lists of Python
+# numbers, and serialized back to plain lists
+FloatColumn = Annotated[Any, PlainValidator(_column('d', float)),
+                        PlainSerializer(array.tolist, return_type=List[float])]
+IntColumn = Annotated[Any, PlainValidator(_column('q', int)),
+                      PlainSerializer(array.tolist, return_type=List[int])]
+
+# Models are read-only response DTOs, built once per response
+_MODEL_CONFIG = ConfigDict(
+    extra='ignore',
+    frozen=True,
+    validate_assignment=False,
+    defer_build=False,
+    populate_by_name=True
+)
+
+# Response rows are built in lists of hundreds per response and only carry
+# data, so they are slotted pydantic dataclasses rather than BaseModels
+_row_dataclass = dataclass(slots=True, kw_only=True, config=_MODEL_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model_type: Any) -> TypeAdapter:
+    """Get the TypeAdapter for a model (or a list of models), built once per type."""
+    return TypeAdapter(model_type)
+
+
+# List responses that must carry at least one item
+NonEmptyList = Annotated[List[T], Field(min_length=1)]
+
+
+@lru_cache(maxsize=None)
+def _construct_fields(model_type: type) -> tuple:
+    """Resolve (name, alias, field info) for each field of a model, once per type."""
+    return tuple((name, info.alias or name, info) for name, info in model_type.__pydantic_fields__.items())
+
+
+class TrustedConstructMixin:
+    """Build rows from already validated data, e.g. a cache, without validating again."""
+    __slots__ = ()
+
+    @classmethod
+    def from_trusted(cls, d: dict):
+        if issubclass(cls, BaseModel):
+            return cls.model_construct(**d)
+        obj = cls.__new__(cls)
+        for name, alias, info in _construct_fields(cls):
+            value = d.get(name, d.get(alias, PydanticUndefined))
+            if value is PydanticUndefined:
+                # Like model_construct, required fields that are missing stay unset
+                if info.is_required():
+                    continue
+                value = info.get_default(call_default_factory=True)
+            object.__setattr__(obj, name, value)
+        return obj
+
+
 # Pydantic models for validation
-class PriceData(BaseModel):
+@_row_dataclass
+class PriceData:
     """Model for price data."""
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     name: Optional[str] = None
     symbol: str
     slug: Optional[str] = None
-    circulating_supply: Optional[str] = None
-    max_supply: Optional[str] = None
-    total_supply: Optional[str] = None
-    last_updated: Optional[str] = None
-    price: float
+    circulating_supply: Optional[float] = None
+    max_supply: Optional[float] = None
+    total_supply: Optional[float] = None
+    last_updated: Optional[datetime] = None
+    price: PositiveFloat
     volume_24h: Optional[float] = None
     market_cap: Optional[float] = None
-    percent_change_1h: Optional[str] = None
-    percent_change_24h: Optional[str] = None
-    percent_change_7d: Optional[str] = None
-    percent_change_30d: Optional[str] = None
-    percent_change_60d: Optional[str] = None
-    percent_change_90d: Optional[str] = None
-    market_cap_dominance: Optional[str] = None
-    fully_diluted_market_cap: Optional[str] = None
-    
-    @field_validator('price')
-    @classmethod
-    def price_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('Price must be positive')
-        return v
+    percent_change_1h: Optional[float] = None
+    percent_change_24h: Optional[float] = None
+    percent_change_7d: Optional[float] = None
+    percent_change_30d: Optional[float] = None
+    percent_change_60d: Optional[float] = None
+    percent_change_90d: Optional[float] = None
+    market_cap_dominance: Optional[float] = None
+    fully_diluted_market_cap: Optional[float] = None
         
-class PriceHistoryPoint(BaseModel):
+@_row_dataclass
+class PriceHistoryPoint(TrustedConstructMixin):
     """Model for a single price history data point."""
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     name: str
     symbol: str
     slug: str
-    circulating_supply: str
-    max_supply: str
-    total_supply: str
-    last_updated: str
+    circulating_supply: float
+    max_supply: float
+    total_supply: float
+    last_updated: datetime
     price: float
     volume_24h: float
     market_cap: float
-    percent_change_1h: str
-    percent_change_24h: str
-    percent_change_7d: str
-    percent_change_30d: str
-    percent_change_60d: str
-    percent_change_90d: str
-    market_cap_dominance: str
-    fully_diluted_market_cap: str
-
-class PriceHistoryData(BaseModel):
-    """Model for price history data."""
-    data: List[PriceHistoryPoint]
-    
-    @field_validator('data')
-    @classmethod
-    def data_must_not_be_empty(cls, v):
-        if not v:
-            raise ValueError('Price history data cannot be empty')
-        return v
+    percent_change_1h: float
+    percent_change_24h: float
+    percent_change_7d: float
+    percent_change_30d: float
+    percent_change_60d: float
+    percent_change_90d: float
+    market_cap_dominance: float
+    fully_diluted_market_cap: float
+
+# List responses are validated with a TypeAdapter over their "data" items,
+# which runs the list validation in a single pydantic-core pass. The adapters
+# are shared with parse_many() so each list schema is only built once
+PriceHistoryListAdapter = type_adapter(NonEmptyList[PriceHistoryPoint])
 
 class NetworkSummaryData(BaseModel):
     """Model for network summary data."""
+    model_config = _MODEL_CONFIG
     total_issuance: str
     total_stake: str
     difficulty: float
@@ -81,9 +204,10 @@ class NetworkSummaryData(BaseModel):
     validator_count: int
     subnet_count: int
 
-class BlockData(BaseModel):
+@_row_dataclass
+class BlockData:
     """Model for block data."""
-    block_number: int
+    block_number: NonNegativeInt
     hash: str
     parent_hash: str
     state_root: str
@@ -92,22 +216,16 @@ class BlockData(BaseModel):
     spec_version: int
     impl_name: str
     impl_version: int
-    timestamp: str
+    timestamp: datetime
     validator: Optional[str] = None
     events_count: int
     extrinsics_count: int
     calls_count: int
-    
-    @field_validator('block_number')
-    @classmethod
-    def block_number_must_be_positive(cls, v):
-        if v < 0:
-            raise ValueError('Block number must be non-negative')
-        return v
 
 class SubnetData(BaseModel):
     """Model for subnet data."""
-    netuid: int
+    model_config = _MODEL_CONFIG
+    netuid: NonNegativeInt
     name: Optional[str] = None
     subnet_owner: str
     max_allowed_validators: int
@@ -117,18 +235,12 @@ class SubnetData(BaseModel):
     tempo: int
     total_stake: str
     emission_value: str
-    
-    @field_validator('netuid')
-    @classmethod
-    def netuid_must_be_non_negative(cls, v):
-        if v < 0:
-            raise ValueError('Subnet ID must be non-negative')
-        return v
 
 class ValidatorData(BaseModel):
     """Model for validator data."""
-    hotkey: str
-    coldkey: str
+    model_config = _MODEL_CONFIG
+    hotkey: SS58Address
+    coldkey: SS58Address
     stake: str
     total_stake: str
     validator_permits: Optional[List[int]] = None
@@ -143,53 +255,50 @@ class ValidatorData(BaseModel):
     is_nominator: bool = False
     subnets: Optional[List[int]] = None
 
-    @field_validator('hotkey', 'coldkey')
-    @classmethod
-    def validate_address_format(cls, v):
-        if not v.startswith('5'):  # Basic check for Substrate address format
-            raise ValueError('Invalid SS58 address format')
-        return v
-
 class EVMAddressData(BaseModel):
     """Model for EVM address data."""
-    address: str
-    balance: str
+    model_config = _MODEL_CONFIG
+    address: EVMAddress
+    balance: Wei
     transactions: int
-    last_transaction_timestamp: Optional[str] = None
-    transfer_history: Optional[List[Dict[str, Any]]] = None
-
-    @field_validator('address')
-    @classmethod
-    def validate_eth_address(cls, v):
-        if not v.startswith('0x') or len(v) != 42:
-            raise ValueError('Invalid Ethereum address format')
-        return v
+    last_transaction_timestamp: Optional[datetime] = None
+    transfer_history: Optional[OpaqueJson] = None
 
 class AccountAddress(BaseModel):
     """Model for account address with ss58 and hex formats."""
-    ss58: str
-    hex: str
-    
-    @field_validator('ss58')
-    @classmethod
-    def validate_ss58_address(cls, v):
-        if not v.startswith('5'):  # Basic check for Substrate address format
-            raise ValueError('Invalid SS58 address format')
-        return v
-    
-    @field_validator('hex')
-    @classmethod
-    def validate_hex_address(cls, v):
-        if not v.startswith('0x'):
-            raise ValueError('Invalid hex address format')
-        return v
+    model_config = _MODEL_CONFIG
+    ss58: SS58Address
+    hex: HexAddress
+
+
+@lru_cache(maxsize=65536)
+def _account_address(ss58: str, hex_: str) -> AccountAddress:
+    return AccountAddress(ss58=ss58, hex=hex_)
+
+
+def _intern_account_address(v: Any) -> Any:
+    if isinstance(v, dict) and len(v) == 2:
+        ss58, hex_ = v.get('ss58'), v.get('hex')
+        if isinstance(ss58, str) and isinstance(hex_, str):
+            try:
+                return _account_address(ss58, hex_)
+            except ValidationError:
+                # Let the field validation report the error
+                pass
+    return v
 
-class AccountInfoData(BaseModel):
+
+# The same addresses recur across many rows (e.g. big validators' keys), and
+# addresses are frozen, so rows share one instance per address
+InternedAccountAddress = Annotated[AccountAddress, BeforeValidator(_intern_account_address)]
+
+@_row_dataclass
+class AccountInfoData(TrustedConstructMixin):
     """Model for detailed account information."""
-    address: AccountAddress
+    address: InternedAccountAddress
     network: str
     block_number: int
-    timestamp: str
+    timestamp: datetime
     rank: int
     balance_free: str
     balance_staked: str
@@ -205,16 +314,15 @@ class AccountInfoData(BaseModel):
     created_on_network: str
     coldkey_swap: Optional[str] = None
 
-class AccountsListResponse(BaseModel):
-    """Model for list of accounts response."""
-    data: List[AccountInfoData]
+AccountsListAdapter = type_adapter(List[AccountInfoData])
 
-class AccountHistoryData(BaseModel):
+@_row_dataclass
+class AccountHistoryData:
     """Model for account history data point."""
-    address: AccountAddress
+    address: InternedAccountAddress
     network: str
     block_number: int
-    timestamp: str
+    timestamp: datetime
     rank: int
     balance_free: str
     balance_staked: str
@@ -225,53 +333,44 @@ class AccountHistoryData(BaseModel):
     created_on_network: str
     coldkey_swap: Optional[str] = None
 
-class AccountHistoryResponse(BaseModel):
-    """Model for account history response."""
-    data: List[AccountHistoryData]
+AccountHistoryListAdapter = type_adapter(List[AccountHistoryData])
 
-class TransferData(BaseModel):
+@_row_dataclass
+class TransferData:
     """Model for new transfer data format."""
     id: str
-    to: AccountAddress
-    from_: AccountAddress = Field(..., alias="from")
+    to: InternedAccountAddress
+    from_: InternedAccountAddress = Field(..., alias="from")
     network: str
     block_number: int
-    timestamp: str
-    amount: str
-    fee: str
+    timestamp: datetime
+    amount: NonNegativeDecimal
+    fee: NonNegativeDecimal
     transaction_hash: str
     extrinsic_id: str
 
-    @field_validator('amount', 'fee')
-    @classmethod
-    def amount_must_be_non_negative(cls, v):
-        if float(v) < 0:
-            raise ValueError('Amount must be non-negative')
-        return v
-
-class TransfersListResponse(BaseModel):
-    """Model for transfers list response."""
-    data: List[TransferData]
+TransfersListAdapter = type_adapter(List[TransferData])
 
-class Exchange(BaseModel):
+@_row_dataclass
+class Exchange:
     """Model for exchange data."""
-    coldkey: AccountAddress
+    coldkey: InternedAccountAddress
     name: str
     icon: Optional[str] = None
 
-class ExchangeListResponse(BaseModel):
-    """Model for exchanges list response."""
-    data: List[Exchange]
+ExchangeListAdapter = type_adapter(List[Exchange])
 
 class ErrorResponse(BaseModel):
     """Model for error responses."""
+    model_config = _MODEL_CONFIG
     error: str
     details: Optional[str] = None
 
-class NetworkStatsData(BaseModel):
+@_row_dataclass
+class NetworkStatsData:
     """Model for network statistics data."""
     block_number: int
-    timestamp: str
+    timestamp: datetime
     issued: str
     staked: str
     accounts: int
@@ -283,52 +382,57 @@ class NetworkStatsData(BaseModel):
     subnets: int
     subnet_registration_cost: str
 
-class NetworkStatsListData(BaseModel):
-    """Model for network statistics list response."""
-    data: List[NetworkStatsData]
+NetworkStatsListAdapter = type_adapter(List[NetworkStatsData])
 
 class RuntimeVersionData(BaseModel):
     """Model for network runtime version data."""
+    model_config = _MODEL_CONFIG
     version: str
     spec_name: str
     spec_version: int
     impl_version: int
     transaction_version: int
     state_version: int
-    timestamp: str
+    timestamp: datetime
 
 class ExtrinsicErrorData(BaseModel):
     """Model for extrinsic error data."""
+    model_config = _MODEL_CONFIG
     extra_info: Optional[str] = None
     name: str
     pallet: str
 
 class ExtrinsicSignatureAddressData(BaseModel):
     """Model for extrinsic signature address data."""
+    model_config = _MODEL_CONFIG
     __kind: str
     value: str
 
 class ExtrinsicSignatureData(BaseModel):
     """Model for extrinsic signature data."""
+    model_config = _MODEL_CONFIG
     __kind: str
     value: str
 
 class ExtrinsicSignatureExtensionsData(BaseModel):
     """Model for extrinsic signature extensions data."""
+    model_config = _MODEL_CONFIG
     chargeTransactionPayment: str
-    checkMetadataHash: Dict[str, Any]
-    checkMortality: Dict[str, Any]
+    checkMetadataHash: OpaqueJson
+    checkMortality: OpaqueJson
     checkNonce: int
 
 class ExtrinsicSignatureInfoData(BaseModel):
     """Model for complete extrinsic signature information."""
+    model_config = _MODEL_CONFIG
     address: ExtrinsicSignatureAddressData
     signature: ExtrinsicSignatureData
     signedExtensions: ExtrinsicSignatureExtensionsData
 
-class ExtrinsicData(BaseModel):
+@_row_dataclass
+class ExtrinsicData(TrustedConstructMixin):
     """Model for extrinsic data."""
-    timestamp: str
+    timestamp: datetime
     block_number: int
     hash: str
     id: str
@@ -342,50 +446,43 @@ class ExtrinsicData(BaseModel):
     error: Optional[ExtrinsicErrorData] = None
     call_id: str
     full_name: str
-    call_args: Dict[str, Any]
+    call_args: OpaqueJson
 
-class ExtrinsicsListData(BaseModel):
-    """Model for extrinsics list response."""
-    data: List[ExtrinsicData]
+ExtrinsicsListAdapter = type_adapter(List[ExtrinsicData])
 
 class CallData(BaseModel):
     """Model for call data."""
+    model_config = _MODEL_CONFIG
     hash: str
     block_num: int
     index: int
     module: str
     call: str
-    args: Dict[str, Any]
+    args: OpaqueJson
     success: bool
-    timestamp: str
+    timestamp: datetime
 
 class ProxyCallData(BaseModel):
     """Model for proxy call data."""
+    model_config = _MODEL_CONFIG
     hash: str
     block_num: int
-    real: str
-    proxy: str
+    real: SS58Address
+    proxy: SS58Address
     call_hash: str
     module: str
     call: str
-    args: Dict[str, Any]
+    args: OpaqueJson
     success: bool
-    timestamp: str
-    
-    @field_validator('real', 'proxy')
-    @classmethod
-    def validate_address_format(cls, v):
-        if not v.startswith('5'):
-            raise ValueError('Invalid SS58 address format')
-        return v
+    timestamp: datetime
 
 class EventArgInfo(BaseModel):
     """Model for event argument information with nested __kind structures."""
     # Using a simple Dict instead of __root__ for Pydantic v2 compatibility
-    class Config:
-        extra = "allow"
+    model_config = ConfigDict({**_MODEL_CONFIG, 'extra': 'allow'})
 
-class EventData(BaseModel):
+@_row_dataclass
+class EventData(TrustedConstructMixin):
     """Model for blockchain event data."""
     id: str
     extrinsic_index: int
@@ -394,32 +491,32 @@ class EventData(BaseModel):
     pallet: str
     name: str
     full_name: str
-    args: Union[Dict[str, Any], List[Any]]
+    args: OpaqueJson
     block_number: int
     extrinsic_id: str
     call_id: Optional[str] = None
-    timestamp: str
+    timestamp: datetime
 
-class EventsListData(BaseModel):
-    """Model for events list response."""
-    data: List[EventData]
+EventsListAdapter = type_adapter(List[EventData])
 
 class TradingViewData(BaseModel):
     """Model for Trading View chart data."""
+    model_config = _MODEL_CONFIG
     symbol: str
     resolution: str
-    c: List[float]  # Close prices
-    h: List[float]  # High prices
-    l: List[float]  # Low prices
-    o: List[float]  # Open prices
-    t: List[int]    # Timestamps
-    v: List[float]  # Volumes
+    c: FloatColumn  # Close prices
+    h: FloatColumn  # High prices
+    l: FloatColumn  # Low prices
+    o: FloatColumn  # Open prices
+    t: IntColumn    # Timestamps
+    v: FloatColumn  # Volumes
     s: str          # Status (e.g., "ok")
 
-class PriceOHLCPoint(BaseModel):
+@_row_dataclass
+class PriceOHLCPoint:
     """Model for a single OHLC price data point."""
     period: str
-    timestamp: str
+    timestamp: datetime
     asset: str
     volume_24h: str
     open: str
@@ -427,19 +524,11 @@ class PriceOHLCPoint(BaseModel):
     low: str
     close: str
 
-class PriceOHLCData(BaseModel):
-    """Model for OHLC price data."""
-    data: List[PriceOHLCPoint]
-    
-    @field_validator('data')
-    @classmethod
-    def data_must_not_be_empty(cls, v):
-        if not v:
-            raise ValueError('OHLC price data cannot be empty')
-        return v
+PriceOHLCListAdapter = type_adapter(NonEmptyList[PriceOHLCPoint])
 
 class TransactionData(BaseModel):
     """Model for transaction data."""
+    model_config = _MODEL_CONFIG
     hash: str
     block_num: int
     from_address: Optional[str] = None
@@ -448,41 +537,86 @@ class TransactionData(BaseModel):
     module: str
     call: str
     success: bool
-    timestamp: str
+    timestamp: datetime
 
 class WalletData(BaseModel):
     """Model for wallet data."""
+    model_config = _MODEL_CONFIG
     address: str
-    balance: str
-    transactions: List[Dict[str, Any]]
+    balance: Wei
+    transactions: OpaqueJson
     stake: Optional[str] = None
-    delegations: Optional[List[Dict[str, Any]]] = None
-    rewards: Optional[List[Dict[str, Any]]] = None
+    delegations: Optional[OpaqueJson] = None
+    rewards: Optional[OpaqueJson] = None
     is_validator: bool = False
     is_delegator: bool = False
 
 class ContractData(BaseModel):
     """Model for contract data."""
+    model_config = _MODEL_CONFIG
     address: str
     creator: Optional[str] = None
     creation_tx: Optional[str] = None
     creation_block: Optional[int] = None
-    bytecode: str
-    abi: Optional[List[Dict[str, Any]]] = None
-    transactions: List[Dict[str, Any]]
-    balance: str
-    timestamp: str
+    bytecode: HexBytes
+    abi: Optional[OpaqueJson] = None
+    transactions: OpaqueJson
+    balance: Wei
+    timestamp: datetime
 
 class LogData(BaseModel):
     """Model for log data."""
+    model_config = _MODEL_CONFIG
     transaction_hash: str
     log_index: int
     address: str
     data: str
     topics: List[str]
     block_number: int
-    timestamp: str
+    timestamp: datetime
+
+BlocksListAdapter = type_adapter(List[BlockData])
+ 
+
+
+def parse_many(model: Any, raw: List[Any]) -> List[Any]:
+    """Validate a list of rows into models in a single pass."""
+    return type_adapter(List[model]).validate_python(raw)
+
+
+def parse_many_json(model: Any, raw: Union[str, bytes]) -> List[Any]:
+    """Validate a JSON array of rows into models without decoding it in Python first."""
+    return type_adapter(List[model]).validate_json(raw)
+
+
+# Numeric columns of the chart-like list responses, by array typecode
+PRICE_HISTORY_COLUMNS = {
+    name: 'd' for name in (
+        'price', 'volume_24h', 'market_cap', 'circulating_supply', 'max_supply', 'total_supply',
+        'percent_change_1h', 'percent_change_24h', 'percent_change_7d', 'percent_change_30d',
+        'percent_change_60d', 'percent_change_90d', 'market_cap_dominance', 'fully_diluted_market_cap'
+    )
+}
+PRICE_OHLC_COLUMNS = {name: 'd' for name in ('open', 'high', 'low', 'close', 'volume_24h')}
+NETWORK_STATS_COLUMNS = {
+    name: 'q' for name in ('block_number', 'accounts', 'balance_holders', 'extrinsics', 'transfers', 'subnets')
+}
+
+
+def to_columns(raw: List[Dict[str, Any]], columns: Dict[str, str]) -> Dict[str, array]:
+    """Build packed numeric columns from raw rows in one pass, without creating models.
+
+    Args:
+        raw: Rows as returned by the API
+        columns: Column names mapped to their array typecode ('d' or 'q')
 
-class BlocksListData(BaseModel):
-    """Model for blocks list response."""
-    data: List[BlockData] 
\ No newline at end of file
+    Returns:
+        One array per column, in row order
+    """
+    result = {name: array(typecode) for name, typecode in columns.items()}
+    appends = [(name, result[name].append, float if typecode == 'd' else int)
+               for name, typecode in columns.items()]
+    for row in raw:
+        for name, append, cast in appends:
+            append(cast(row[name]))
+    return result
@@ -1,17 +1,23 @@
 from mcp.server.fastmcp import FastMCP
+import asyncio
 import httpx
+from functools import lru_cache, partial
+from urllib.parse import urlencode
+import json
 import os
 import logging
+import random
+import re
 import sys
-from typing import Any, Optional, Dict, Literal
-from datetime import datetime, timedelta
+import time
+from typing import Any, Optional, Dict, List, Literal
 from cache_service import tao_stats_cache
 
-from models import (TradingViewData, PriceData, PriceHistoryData, PriceOHLCData,
-                    AccountsListResponse, AccountHistoryResponse,
-                    TransfersListResponse, ExchangeListResponse,
-                    BlocksListData,  ExtrinsicsListData,
-                    EventsListData, NetworkStatsData, NetworkStatsListData)
+from models import (type_adapter, TradingViewData, PriceData, PriceHistoryListAdapter, PriceOHLCListAdapter,
+                    AccountsListAdapter, AccountHistoryListAdapter,
+                    TransfersListAdapter, ExchangeListAdapter,
+                    BlocksListAdapter, ExtrinsicsListAdapter,
+                    EventsListAdapter, NetworkStatsData, NetworkStatsListAdapter)
 
 # Create an MCP server
 mcp = FastMCP("TaoStats")
@@ -21,6 +27,16 @@ TAOSTATS_API_BASE_URL = "https://api.taostats.io/api"
 TAOSTATS_DTAO_API_BASE_URL = "https://api.taostats.io/api/dtao"
 TAOSTATS_API_KEY = os.getenv("TAOSTATS_API_KEY")
 
+# Transient statuses retried with backoff, other errors fail fast
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+# Longest Retry-After waited for, in seconds, so a tool call is never held for minutes.
+# Responses asking for a longer wait are not retried
+MAX_RETRY_AFTER = 30.0
+
+# SS58 address, or 0x-prefixed hex EVM address (20 bytes) or public key (32 bytes)
+ADDRESS_RE = re.compile(r"^(5[1-9A-HJ-NP-Za-km-z]{47}|0x(?:[0-9a-fA-F]{40}|[0-9a-fA-F]{64}))$")
+
 # Configure logging to write to stderr
 logging.basicConfig(
     level=logging.INFO,
@@ -29,27 +45,247 @@ logging.basicConfig(
 )
 logger = logging.getLogger("financial-datasets-mcp")
 
+# Set up authorization headers once - Use direct Authorization header without Bearer prefix
+_AUTH_HEADERS = {"Authorization": TAOSTATS_API_KEY} if TAOSTATS_API_KEY else {}
+
+# Log the API key status once at startup (redacting actual key value)
+if TAOSTATS_API_KEY:
+    # Only log the first few characters to avoid exposing the full key
+    _masked_key = TAOSTATS_API_KEY[:4] + "..." if len(TAOSTATS_API_KEY) > 4 else "too short"
+    logging.info(f"Using API key starting with: {_masked_key}")
+else:
+    logging.error("API KEY NOT FOUND! Set TAOSTATS_API_KEY environment variable.")
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib
+    orjson = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared async client so connections to the API are kept alive and reused
+# across tool calls instead of paying a TCP+TLS handshake per request, and so
+# concurrent tool calls overlap instead of blocking the event loop
+_CLIENT = httpx.AsyncClient(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    # 5 seconds for connection, 120 seconds total
+    timeout=httpx.Timeout(connect=5.0, read=120.0, write=120.0, pool=120.0)
+)
+
 # Helper function to validate API responses
 def validate_response(data, model_class):
     """Validate API response data against Pydantic model.
 
     Args:
         data: Response data from the API
-        model_class: Pydantic model class to validate against
+        model_class: Pydantic model or dataclass to validate against
 
     Returns:
         Validated data (either a single item or a list)
     """
     try:
-        if isinstance(data, list):
-            return [model_class(**item).dict() for item in data]
-        return model_class(**data).dict()
+        adapter = type_adapter(List[model_class] if isinstance(data, list) else model_class)
+        return adapter.dump_python(adapter.validate_python(data), mode="json")
     except Exception as e:
         # Validation failed, log the error and return original data
         logger.warning(f"Validation error: {e}")
         return data
 
-def make_api_request(endpoint, params=None, version="v1", use_dtao=False):
+def validate_list_response(data, adapter):
+    """Validate the "data" items of an API list response.
+
+    Args:
+        data: Response data from the API
+        adapter: Pydantic TypeAdapter for the list of items
+
+    Returns:
+        Validated data with the items under "data"
+    """
+    try:
+        items = adapter.validate_python(data["data"])
+        return {"data": adapter.dump_python(items, mode="json")}
+    except Exception as e:
+        # Validation failed, log the error and return original data
+        logger.warning(f"Validation error: {e}")
+        return data
+
+def decode_json(content):
+    """Decode a JSON response body, with orjson when it is installed.
+
+    Args:
+        content: Raw response body
+
+    Returns:
+        Decoded JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def drop_none(params):
+    """Drop request parameters that are not set.
+
+    Args:
+        params: Request parameters, unset ones are None
+
+    Returns:
+        The parameters that are set
+    """
+    return {k: v for k, v in params.items() if v is not None}
+
+class IncompleteResultError(Exception):
+    """Raised by the iterators when part of the data could not be fetched, as a request was rate limited or failed."""
+
+def response_rows(response):
+    """Get the items of an API list response.
+
+    Args:
+        response: Response from make_api_request
+
+    Returns:
+        The items under "data", or None if the request was rate limited (None response) or failed (error payload)
+    """
+    if isinstance(response, dict) and "error" not in response and isinstance(response.get("data"), list):
+        return response["data"]
+    return None
+
+def check_query_params(page, limit, block_start=None, block_end=None, timestamp_start=None, timestamp_end=None):
+    """Check the pagination and range arguments shared by the list tools.
+
+    Args:
+        page: Page number, must be positive
+        limit: Number of entries per page, between 1 and 200
+        block_start: Start of block range (optional)
+        block_end: End of block range (optional)
+        timestamp_start: Start of timestamp range (optional)
+        timestamp_end: End of timestamp range (optional)
+
+    Raises:
+        ValueError: If an argument is out of range
+    """
+    if limit <= 0 or limit > 200:
+        raise ValueError("Limit must be between 1 and 200")
+    
+    if page <= 0:
+        raise ValueError("Page must be positive")
+    
+    if block_start is not None and block_end is not None and block_start > block_end:
+        raise ValueError("block_start must be less than or equal to block_end")
+    
+    if timestamp_start is not None and timestamp_end is not None and timestamp_start > timestamp_end:
+        raise ValueError("timestamp_start must be less than or equal to timestamp_end")
+
+def check_address(name, value):
+    """Check that an optional address argument is an SS58 or 0x-prefixed hex address.
+
+    Args:
+        name: Argument name, used in the error message
+        value: Address to check, None is accepted
+
+    Raises:
+        ValueError: If the address is malformed
+    """
+    if value is not None and not ADDRESS_RE.match(value):
+        raise ValueError(f"Invalid {name} format: {value}")
+
+def make_cache_key(url, params=None):
+    """Build a cache key for a request that does not depend on the order of params.
+
+    Args:
+        url: Request URL
+        params: Request parameters (optional)
+
+    Returns:
+        The URL followed by the sorted, URL-encoded parameters
+    """
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted((k, v) for k, v in params.items() if v is not None))}"
+
+def retry_delay(response, attempt):
+    """Get the time to wait before retrying a request.
+
+    Args:
+        response: Response of the failed attempt
+        attempt: Number of the failed attempt, from 0
+
+    Returns:
+        Delay in seconds, from the Retry-After header if it gives one in seconds,
+        else an exponential backoff with jitter. None if Retry-After is longer
+        than MAX_RETRY_AFTER, as an earlier retry would fail again
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            delay = max(float(retry_after), 0.0)
+        except ValueError:
+            pass  # An HTTP date, fall back to the backoff
+        else:
+            return delay if delay <= MAX_RETRY_AFTER else None
+    return min(2 ** attempt * 0.1, 5.0) + random.random() * 0.1
+
+@lru_cache(maxsize=None)
+def api_url(endpoint, version="v1", use_dtao=False):
+    """Build the request URL for an endpoint, worked out once per endpoint.
+
+    Args:
+        endpoint: API endpoint
+        version: API version (default v1)
+        use_dtao: Whether to use the DTAO API base URL
+
+    Returns:
+        Full request URL
+    """
+    if use_dtao:
+        # Format for DTAO API: https://api.taostats.io/api/dtao/{endpoint}/{version}
+        return f"{TAOSTATS_DTAO_API_BASE_URL}/{endpoint}"
+    if endpoint.startswith("dtao/"):
+        # Legacy format for dtao endpoints
+        return f"{TAOSTATS_API_BASE_URL}/{endpoint}"
+    # Format for API v1: https://api.taostats.io/api/{endpoint}/{version}
+    return f"{TAOSTATS_API_BASE_URL}/{endpoint}/{version}"
+
+@lru_cache(maxsize=None)
+def cache_ttl_ms(endpoint):
+    """Get the cache TTL for an endpoint, worked out once per endpoint.
+
+    Args:
+        endpoint: API endpoint
+
+    Returns:
+        Time-to-live in milliseconds
+    """
+    # Long-lived data can be cached longer
+    if any(k in endpoint for k in ['registration', 'historical', 'history']):
+        # Historical data rarely changes, cache for 24 hours
+        return 24 * 60 * 60 * 1000  # 24 hours in milliseconds
+    elif any(k in endpoint for k in ['neuron', 'subnet', 'stake']):
+        # Semi-dynamic data, cache for 1 hour
+        return 60 * 60 * 1000  # 1 hour in milliseconds
+    else:
+        # More dynamic data, cache for 5 minutes
+        return 5 * 60 * 1000  # 5 minutes in milliseconds
+
+def validate_first_item(data, model_class):
+    """Validate the first item of an API list response, for "latest" endpoints.
+
+    Args:
+        data: Response data from the API
+        model_class: Pydantic model or dataclass to validate against
+
+    Returns:
+        The validated first item, or the original data if there are no items
+    """
+    if isinstance(data, dict) and "data" in data and data["data"]:
+        return validate_response(data["data"][0], model_class)
+    return data
+
+async def make_api_request(endpoint, params=None, version="v1", use_dtao=False, validate=None):
     """Construct and send request to TaoStats API.
 
     Args:
@@ -57,81 +293,83 @@ def make_api_request(endpoint, params=None, version="v1", use_dtao=False):
         params: Request parameters (optional)
         version: API version (default v1)
         use_dtao: Whether to use the DTAO API base URL
+        validate: Function applied to the response before it is cached (optional)
 
     Returns:
         Response data from API
     """
-    # Check if API key exists and log its status (redacting actual key value)
-    api_key = os.getenv("TAOSTATS_API_KEY")
-    if api_key:
-        # Only log the first few characters to avoid exposing the full key
-        masked_key = api_key[:4] + "..." if len(api_key) > 4 else "too short"
-        logging.info(f"Using API key starting with: {masked_key}")
-    else:
+    # The API key is read once at import
+    if not TAOSTATS_API_KEY:
         logging.error("API KEY NOT FOUND! Set TAOSTATS_API_KEY environment variable.")
         # Return empty data instead of failing to prevent server crash
         return {"data": []}
     
-    # Set up authorization headers - Use direct Authorization header without Bearer prefix
-    headers = {"Authorization": api_key} if api_key else {}
-    
-    if use_dtao:
-        # Format for DTAO API: https://api.taostats.io/api/dtao/{endpoint}/{version}
-        url = f"{TAOSTATS_DTAO_API_BASE_URL}/{endpoint}"
-        
-    elif endpoint.startswith("dtao/"):
-        # Legacy format for dtao endpoints
-        url = f"{TAOSTATS_API_BASE_URL}/{endpoint}"
-    else:
-        # Format for API v1: https://api.taostats.io/api/{endpoint}/{version}
-        url = f"{TAOSTATS_API_BASE_URL}/{endpoint}/{version}"
+    url = api_url(endpoint, version, use_dtao)
     
-    # Debug log the request URL
-    logging.info(f"Making request to URL: {url}")
+    # Debug log the request URL (formatted only if INFO is enabled)
+    logging.info("Making request to URL: %s", url)
     
     # Create a unique cache key based on endpoint, params, and version
-    cache_key = f"{url}:{str(params)}"
+    cache_key = make_cache_key(url, params)
     
     # Define the actual request function that will be called or cached
-    def make_actual_request():
+    async def make_actual_request():
         try:
-            # Add timeout to prevent hanging requests (5 seconds for connection, 120 seconds total)
-            response = httpx.get(url, params=params, headers=headers, timeout=httpx.Timeout(connect=5.0, read=120.0, write=120.0, pool=120.0))
+            # The client's timeout prevents hanging requests
+            for attempt in range(MAX_RETRIES + 1):
+                response = await _CLIENT.get(url, params=params, headers=_AUTH_HEADERS)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    break
+                # Rate limited or server error, which may pass
+                delay = retry_delay(response, attempt)
+                if delay is None:
+                    logging.warning("HTTP %s from %s asks to wait over %d seconds, not retrying",
+                                    response.status_code, url, MAX_RETRY_AFTER)
+                    break
+                logging.warning("HTTP %s from %s, retrying in %.1f seconds", response.status_code, url, delay)
+                await asyncio.sleep(delay)
+                # Each retry is another request against the rate limit
+                if not tao_stats_cache.record_retry():
+                    logging.warning("API rate limit reached, not retrying %s", url)
+                    break
             response.raise_for_status()
-            return response.json()
+            return decode_json(response.content)
         except httpx.TimeoutException as e:
-            logging.error(f"Request timeout: {e}")
-            logging.error(f"Request to {url} timed out after 120 seconds.")
+            logging.error("Request timeout: %s", e)
+            logging.error("Request to %s timed out after 120 seconds.", url)
             # Return empty data instead of raising an exception to prevent server crash
             return {"data": [], "error": "Request timed out"}
         except httpx.HTTPStatusError as e:
-            logging.error(f"HTTP error: {e}")
+            logging.error("HTTP error: %s", e)
             if e.response.status_code == 401:
                 logging.error("401 Unauthorized: API key is invalid or not correctly set.")
                 logging.error("Check your API key in the environment variables or MCP config.")
             # Return empty data instead of raising an exception to prevent server crash
-            return {"data": []}
+            return {"data": [], "error": f"HTTP {e.response.status_code}"}
         except Exception as e:
-            logging.error(f"Unexpected error during API request: {e}")
+            logging.error("Unexpected error during API request: %s", e)
             # Return empty data instead of raising an exception to prevent server crash
-            return {"data": []}
+            return {"data": [], "error": "Request failed"}
     
-    # Use cache with appropriate settings for different endpoints
-    # Long-lived data can be cached longer
-    if any(k in endpoint for k in ['registration', 'historical', 'history']):
-        # Historical data rarely changes, cache for 24 hours
-        ttl = 24 * 60 * 60 * 1000  # 24 hours in milliseconds
-    elif any(k in endpoint for k in ['neuron', 'subnet', 'stake']):
-        # Semi-dynamic data, cache for 1 hour
-        ttl = 60 * 60 * 1000  # 1 hour in milliseconds
-    else:
-        # More dynamic data, cache for 5 minutes
-        ttl = 5 * 60 * 1000  # 5 minutes in milliseconds
+    ttl = cache_ttl_ms(endpoint)
+    
+    # Validated responses are cached under their own keys, so cache hits return
+    # the validated data without validating it again
+    load = make_actual_request
+    if validate is not None:
+        cache_key = f"validated:{cache_key}"
+        
+        async def load():
+            data = await make_actual_request()
+            # Error payloads are returned as they are, so callers can tell them from empty results
+            if isinstance(data, dict) and "error" in data:
+                return data
+            return validate(data)
     
     # Use the cache service
-    return tao_stats_cache.with_cache(
+    return await tao_stats_cache.with_cache(
         cache_key,
-        make_actual_request,
+        load,
         {
             'ttl': ttl,
             'fallback_to_cache': True,
@@ -139,8 +377,99 @@ def make_api_request(endpoint, params=None, version="v1", use_dtao=False):
         }
     )
 
+async def make_api_batch_request(requests, validate=None):
+    """Make several API requests concurrently.
+
+    Args:
+        requests: (endpoint, params) pairs of the requests
+        validate: Function applied to each response before it is cached (optional)
+
+    Returns:
+        Responses in the order of the requests
+    """
+    # The requests share the client's connections (multiplexed with HTTP/2),
+    # and each goes through the cache, so repeated requests are fetched once
+    return await asyncio.gather(
+        *(make_api_request(endpoint, params, validate=validate) for endpoint, params in requests)
+    )
+
+# Background fetches of the page after the last one returned, bounded so that
+# paging through a long list cannot pile up requests
+_MAX_PREFETCHES = 2
+_prefetch_tasks = set()
+
+def _prefetch_next_page(endpoint, base_params, page, response, validate=None):
+    """Fetch the page after a full page in the background, to cache it for the likely follow-up call.
+
+    Args:
+        endpoint: API endpoint to access
+        base_params: Request parameters of the fetched page, "page" is set per request
+        page: Page number of the fetched page
+        response: Response of the fetched page
+        validate: Function applied to the page before it is cached (optional)
+    """
+    limit = base_params.get("limit")
+    if not (isinstance(response, dict) and isinstance(response.get("data"), list)
+            and limit and len(response["data"]) == limit):
+        return
+    # Only prefetch while at least half of the rate limit window is left for the client's own calls,
+    # counting the prefetches still in flight and this one
+    if len(_prefetch_tasks) >= _MAX_PREFETCHES:
+        return
+    remaining = tao_stats_cache.get_cache_stats()['api_calls_remaining'] - len(_prefetch_tasks) - 1
+    if remaining < tao_stats_cache.minute_request_limit // 2:
+        return
+    
+    async def prefetch():
+        try:
+            await make_api_request(endpoint, {**base_params, "page": page + 1}, validate=validate)
+        except Exception as e:
+            logging.debug("Prefetch of %s page %d failed: %s", endpoint, page + 1, e)
+    
+    task = asyncio.ensure_future(prefetch())
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+async def _fetch_pages(endpoint, base_params, pages, validate=None):
+    """Fetch several pages of a list endpoint concurrently.
+
+    Args:
+        endpoint: API endpoint to access
+        base_params: Request parameters, "page" is set per request
+        pages: Page numbers to fetch
+        validate: Function applied to each page before it is cached (optional)
+
+    Returns:
+        Response data with the items of all pages under "data", in page order. Pages that
+        could not be fetched are listed under "missing_pages", with an "error"
+    """
+    if len(pages) == 1:
+        response = await make_api_request(endpoint, {**base_params, "page": pages[0]}, validate=validate)
+        _prefetch_next_page(endpoint, base_params, pages[-1], response, validate)
+        return response
+    
+    responses = await make_api_batch_request(
+        [(endpoint, {**base_params, "page": page}) for page in pages], validate=validate
+    )
+    _prefetch_next_page(endpoint, base_params, pages[-1], responses[-1], validate)
+    items = []
+    missing_pages = []
+    for page, response in zip(pages, responses):
+        rows = response_rows(response)
+        if rows is None:
+            missing_pages.append(page)
+        else:
+            items.extend(rows)
+    result = {"data": items}
+    # Report rate limited or failed pages, rather than pass the other pages off as the whole result
+    if missing_pages:
+        result["error"] = (f"Pages {', '.join(map(str, missing_pages))} could not be fetched "
+                           "(API rate limit reached or request failed)")
+        result["missing_pages"] = missing_pages
+    return result
+
 @mcp.tool(description='Retrieve TAO/dTAO price data including current price, historical prices, and OHLC data for market analysis')
-def get_price_data(data_type: Literal["current", "history", "ohlc"] = "current", 
+async def get_price_data(data_type: Literal["current", "history", "ohlc"] = "current", 
                   days: int = 30, 
                   periods: str = "1d") -> Dict:
     """Get TAO price data with various options
@@ -164,15 +493,12 @@ def get_price_data(data_type: Literal["current", "history", "ohlc"] = "current",
             "asset": "tao"
         }
         
-        response_data = make_api_request("price/latest", params)
-        # API returns data within a "data" field
-        if isinstance(response_data, dict) and "data" in response_data and response_data["data"]:
-            # Return just the first item
-            return validate_response(response_data["data"][0], PriceData)
-        return response_data
+        # API returns data within a "data" field, return just the first item
+        return await make_api_request("price/latest", params,
+                                      validate=partial(validate_first_item, model_class=PriceData))
     elif data_type == "history":
         # Convert days to timestamp range
-        end_timestamp = int(datetime.now().timestamp())
+        end_timestamp = int(time.time())
         start_timestamp = end_timestamp - (days * 24 * 60 * 60)
         
         params = {
@@ -183,12 +509,12 @@ def get_price_data(data_type: Literal["current", "history", "ohlc"] = "current",
             "order": "timestamp_desc"  # Most recent first
         }
         
-        response_data = make_api_request("price/history", params)
         # API returns list of price points within a "data" field
-        return validate_response(response_data, PriceHistoryData)
+        return await make_api_request("price/history", params,
+                                      validate=partial(validate_list_response, adapter=PriceHistoryListAdapter))
     elif data_type == "ohlc":
         # Convert days to timestamp range if needed
-        end_timestamp = int(datetime.now().timestamp())
+        end_timestamp = int(time.time())
         start_timestamp = end_timestamp - (days * 24 * 60 * 60)
         
         params = {
@@ -199,14 +525,100 @@ def get_price_data(data_type: Literal["current", "history", "ohlc"] = "current",
             "limit": 100  # Reasonable limit for OHLC data
         }
         
-        response_data = make_api_request("price/ohlc", params)
         # API returns OHLC data within a "data" field
-        return validate_response(response_data, PriceOHLCData)
+        return await make_api_request("price/ohlc", params,
+                                      validate=partial(validate_list_response, adapter=PriceOHLCListAdapter))
     else:
         raise ValueError(f"Invalid data_type: {data_type}")
     
+async def _get_accounts(page_numbers, network, page, limit, address, order, **_):
+    """Get the accounts list, for get_wallet_data(data_type="account")."""
+    # For accounts listing, include all filtering parameters
+    params = drop_none({
+        "network": network,
+        "page": page,
+        "limit": limit,
+        "address": address,
+        "order": order
+    })
+    
+    # Make API request for accounts list
+    return await _fetch_pages("account/latest", params, page_numbers,
+                              validate=partial(validate_list_response, adapter=AccountsListAdapter))
+
+async def _get_account_history(page_numbers, network, page, limit, order, block_number, block_start,
+                               block_end, timestamp_start, timestamp_end, **_):
+    """Get account history, for get_wallet_data(data_type="account_history")."""
+    params = drop_none({
+        "network": network,
+        "page": page,
+        "limit": limit,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "order": order
+    })
+    
+    return await _fetch_pages("account/history", params, page_numbers,
+                              validate=partial(validate_list_response, adapter=AccountHistoryListAdapter))
+
+async def _get_transfers(page_numbers, network, page, limit, address, order, block_number, block_start,
+                         block_end, timestamp_start, timestamp_end, from_address, to_address,
+                         transaction_hash, extrinsic_id, amount_min, amount_max, **_):
+    """Get transfers, for get_wallet_data(data_type="transfers")."""
+    params = drop_none({
+        "network": network,
+        "page": page,
+        "limit": limit,
+        "address": address,
+        "from": from_address,
+        "to": to_address,
+        "transaction_hash": transaction_hash,
+        "extrinsic_id": extrinsic_id,
+        "amount_min": amount_min,
+        "amount_max": amount_max,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "order": order
+    })
+    
+    return await _fetch_pages("transfer", params, page_numbers,
+                              validate=partial(validate_list_response, adapter=TransfersListAdapter))
+
+async def _get_exchanges(page_numbers, network, page, limit, address, order, block_number, block_start,
+                         block_end, timestamp_start, timestamp_end, **_):
+    """Get exchanges, for get_wallet_data(data_type="exchanges")."""
+    params = drop_none({
+        "network": network,
+        "page": page,
+        "limit": limit,
+        "address": address,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "order": order
+    })
+    
+    return await _fetch_pages("exchange", params, page_numbers,
+                              validate=partial(validate_list_response, adapter=ExchangeListAdapter))
+
+# Handler for each get_wallet_data data_type
+_WALLET_DATA_HANDLERS = {
+    "account": _get_accounts,
+    "account_history": _get_account_history,
+    "transfers": _get_transfers,
+    "exchanges": _get_exchanges
+}
+
 @mcp.tool(description='Access wallet and account data including balances, transaction history, and token transfers')
-def get_wallet_data(data_type: Literal["account", "account_history", "transfers", "exchanges"] = "transfers",
+async def get_wallet_data(data_type: Literal["account", "account_history", "transfers", "exchanges"] = "transfers",
                    address: Optional[str] = None,
                    network: str = "finney",
                    order: Optional[str] = None,
@@ -223,7 +635,8 @@ def get_wallet_data(data_type: Literal["account", "account_history", "transfers"
                    amount_max: Optional[str] = None,
                    page: int = 1,
                    limit: int = 50,
-                   days: int = 30) -> Dict:
+                   days: int = 30,
+                   pages: int = 1) -> Dict:
     """Get wallet/account data with various options
     
     Args:
@@ -245,170 +658,55 @@ def get_wallet_data(data_type: Literal["account", "account_history", "transfers"
         page: Page number for pagination (defaults to 1)
         limit: Number of entries to return (max 200, defaults to 50)
         days: Number of days for historical data (deprecated)
+        pages: Number of consecutive pages to fetch concurrently, starting at page (max 10, defaults to 1).
+            Pages that could not be fetched, e.g. past the API rate limit, are listed under "missing_pages"
     """
     # Validate input parameters
-    if limit <= 0 or limit > 200:
-        raise ValueError("Limit must be between 1 and 200")
-        
-    if page <= 0:
-        raise ValueError("Page must be positive")
+    check_query_params(page, limit)
     
     if days <= 0:
         raise ValueError("Days must be positive")
     
+    if pages <= 0 or pages > 10:
+        raise ValueError("Pages must be between 1 and 10")
+    
+    page_numbers = list(range(page, page + pages))
+    
     # Check if address is required for the selected data_type and validate format
     address_required = ["account", "account_history"]
     if data_type in address_required and address is None:
         raise ValueError(f"address is required for {data_type} data type")
         
-    if address is not None and not address.startswith('5') and not address.startswith('0x'):
-        raise ValueError(f"Invalid address format: {address}")
-        
-    if from_address is not None and not from_address.startswith('5') and not from_address.startswith('0x'):
-        raise ValueError(f"Invalid from_address format: {from_address}")
-        
-    if to_address is not None and not to_address.startswith('5') and not to_address.startswith('0x'):
-        raise ValueError(f"Invalid to_address format: {to_address}")
-    
-    # Set up parameters based on data_type
-    if data_type == "account":
-        # For accounts listing, include all filtering parameters
-        params = {
-            "network": network,
-            "page": page,
-            "limit": limit
-        }
-        
-        # Add optional filter parameters if provided
-        if address is not None:
-            params["address"] = address
-            
-        if order is not None:
-            params["order"] = order
-            
-        # Make API request for accounts list
-        response_data = make_api_request("account/latest", params)
-        return validate_response(response_data, AccountsListResponse)
-
-    
-    elif data_type == "account_history":
-        # For account history
-        params = {
-            "network": network,
-            "page": page,
-            "limit": limit
-        }
-        
-        # Add optional filter parameters if provided
-        if block_number is not None:
-            params["block_number"] = block_number
-            
-        if block_start is not None:
-            params["block_start"] = block_start
-            
-        if block_end is not None:
-            params["block_end"] = block_end
-            
-        if timestamp_start is not None:
-            params["timestamp_start"] = timestamp_start
-            
-        if timestamp_end is not None:
-            params["timestamp_end"] = timestamp_end
-            
-        if order is not None:
-            params["order"] = order
-        
-        response_data = make_api_request(f"account/history", params)
-        return validate_response(response_data, AccountHistoryResponse)
-    
-    elif data_type == "transfers":
-        # For transfers
-        params = {
-            "network": network,
-            "page": page,
-            "limit": limit
-        }
-        
-        # Add all possible filter parameters for transfers
-        if address is not None:
-            params["address"] = address
-            
-        if from_address is not None:
-            params["from"] = from_address
-            
-        if to_address is not None:
-            params["to"] = to_address
-            
-        if transaction_hash is not None:
-            params["transaction_hash"] = transaction_hash
-            
-        if extrinsic_id is not None:
-            params["extrinsic_id"] = extrinsic_id
-            
-        if amount_min is not None:
-            params["amount_min"] = amount_min
-            
-        if amount_max is not None:
-            params["amount_max"] = amount_max
-            
-        if block_number is not None:
-            params["block_number"] = block_number
-            
-        if block_start is not None:
-            params["block_start"] = block_start
-            
-        if block_end is not None:
-            params["block_end"] = block_end
-            
-        if timestamp_start is not None:
-            params["timestamp_start"] = timestamp_start
-            
-        if timestamp_end is not None:
-            params["timestamp_end"] = timestamp_end
-            
-        if order is not None:
-            params["order"] = order
-            
-        response_data = make_api_request("transfer", params)
-        return validate_response(response_data, TransfersListResponse)
-    
-    elif data_type == "exchanges":
-        # For exchanges
-        params = {
-            "network": network,
-            "page": page,
-            "limit": limit
-        }
-        
-        if address is not None:
-            params["address"] = address
-            
-        if block_number is not None:
-            params["block_number"] = block_number
-            
-        if block_start is not None:
-            params["block_start"] = block_start
-            
-        if block_end is not None:
-            params["block_end"] = block_end
-            
-        if timestamp_start is not None:
-            params["timestamp_start"] = timestamp_start
-            
-        if timestamp_end is not None:
-            params["timestamp_end"] = timestamp_end
-            
-        if order is not None:
-            params["order"] = order
-        
-        response_data = make_api_request("exchange", params)
-        return validate_response(response_data, ExchangeListResponse)
+    check_address("address", address)
+    check_address("from_address", from_address)
+    check_address("to_address", to_address)
     
-    else:
+    handler = _WALLET_DATA_HANDLERS.get(data_type)
+    if handler is None:
         raise ValueError(f"Invalid data_type: {data_type}")
+    
+    return await handler(
+        page_numbers=page_numbers,
+        network=network,
+        page=page,
+        limit=limit,
+        address=address,
+        order=order,
+        block_number=block_number,
+        block_start=block_start,
+        block_end=block_end,
+        timestamp_start=timestamp_start,
+        timestamp_end=timestamp_end,
+        from_address=from_address,
+        to_address=to_address,
+        transaction_hash=transaction_hash,
+        extrinsic_id=extrinsic_id,
+        amount_min=amount_min,
+        amount_max=amount_max
+    )
 
 @mcp.tool(description='Retrieve Trading View chart data for subnet price analysis with customizable time ranges and resolutions')
-def get_trading_view_data(symbol: str = "SUB-1", 
+async def get_trading_view_data(symbol: str = "SUB-1", 
                          resolution: str = "1D", 
                          from_timestamp: Optional[int] = None, 
                          to_timestamp: Optional[int] = None) -> Dict:
@@ -423,11 +721,11 @@ def get_trading_view_data(symbol: str = "SUB-1",
     # Set up default timestamps if not provided
     if from_timestamp is None:
         # Default to 30 days ago
-        from_timestamp = int((datetime.now() - timedelta(days=30)).timestamp())
+        from_timestamp = int(time.time()) - 30 * 24 * 60 * 60
     
     if to_timestamp is None:
         # Default to current time
-        to_timestamp = int(datetime.now().timestamp())
+        to_timestamp = int(time.time())
         
     # Validate input parameters
     if from_timestamp >= to_timestamp:
@@ -441,7 +739,8 @@ def get_trading_view_data(symbol: str = "SUB-1",
         "to": to_timestamp
     }
     
-    response_data = make_api_request("tradingview/udf/history", params, use_dtao=True)
+    response_data = await make_api_request("tradingview/udf/history", params, use_dtao=True,
+                                           validate=partial(validate_response, model_class=TradingViewData))
     
     # Check if response is empty or has the empty data structure
     if not response_data or (isinstance(response_data, dict) and response_data.get('data') == []):
@@ -459,10 +758,10 @@ def get_trading_view_data(symbol: str = "SUB-1",
             "s": "no_data"  # Status
         }
     
-    return validate_response(response_data, TradingViewData)
+    return response_data
 
 @mcp.tool(description='Retrieve blockchain blocks data with filtering options for block numbers, timestamps, and other attributes')
-def get_blocks_data(block_start: Optional[int] = None,
+async def get_blocks_data(block_start: Optional[int] = None,
                    block_end: Optional[int] = None,
                    timestamp_start: Optional[int] = None,
                    timestamp_end: Optional[int] = None,
@@ -489,59 +788,29 @@ def get_blocks_data(block_start: Optional[int] = None,
         limit: Number of entries to return (defaults to 50, max 200)
     """
     # Validate input parameters
-    if limit <= 0 or limit > 200:
-        raise ValueError("Limit must be between 1 and 200")
-        
-    if page <= 0:
-        raise ValueError("Page must be positive")
-    
-    # Validate range parameters
-    if block_start is not None and block_end is not None and block_start > block_end:
-        raise ValueError("block_start must be less than or equal to block_end")
-        
-    if timestamp_start is not None and timestamp_end is not None and timestamp_start > timestamp_end:
-        raise ValueError("timestamp_start must be less than or equal to timestamp_end")
+    check_query_params(page, limit, block_start, block_end, timestamp_start, timestamp_end)
     
     # Set up parameters
-    params = {
+    params = drop_none({
         "page": page,
-        "limit": limit
-    }
-    
-    # Add filter parameters if provided
-    if block_start is not None:
-        params["block_start"] = block_start
-        
-    if block_end is not None:
-        params["block_end"] = block_end
-        
-    if timestamp_start is not None:
-        params["timestamp_start"] = timestamp_start
-        
-    if timestamp_end is not None:
-        params["timestamp_end"] = timestamp_end
-        
-    if block_number is not None:
-        params["block_number"] = block_number
-        
-    if hash is not None:
-        params["hash"] = hash
-        
-    if spec_version is not None:
-        params["spec_version"] = spec_version
-        
-    if validator is not None:
-        params["validator"] = validator
-        
-    if order is not None:
-        params["order"] = order
+        "limit": limit,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "block_number": block_number,
+        "hash": hash,
+        "spec_version": spec_version,
+        "validator": validator,
+        "order": order
+    })
     
     # Make API request for blocks list
-    response_data = make_api_request("block", params)
-    return validate_response(response_data, BlocksListData)
+    return await make_api_request("block", params,
+                                  validate=partial(validate_list_response, adapter=BlocksListAdapter))
 
 @mcp.tool(description='Retrieve blockchain extrinsic (transaction) data with filtering options based on block, time, sender, or transaction type')
-def get_extrinsics_data(block_number: Optional[int] = None,
+async def get_extrinsics_data(block_number: Optional[int] = None,
                        block_start: Optional[int] = None,
                        block_end: Optional[int] = None,
                        timestamp_start: Optional[int] = None,
@@ -570,62 +839,81 @@ def get_extrinsics_data(block_number: Optional[int] = None,
         order: Ordering of results (e.g., "block_number_desc")
     """
     # Validate input parameters
-    if limit <= 0 or limit > 200:
-        raise ValueError("Limit must be between 1 and 200")
-        
-    if page <= 0:
-        raise ValueError("Page must be positive")
-    
-    # Validate range parameters
-    if block_start is not None and block_end is not None and block_start > block_end:
-        raise ValueError("block_start must be less than or equal to block_end")
-        
-    if timestamp_start is not None and timestamp_end is not None and timestamp_start > timestamp_end:
-        raise ValueError("timestamp_start must be less than or equal to timestamp_end")
+    check_query_params(page, limit, block_start, block_end, timestamp_start, timestamp_end)
     
     # Set up parameters
-    params = {
+    params = drop_none({
         "page": page,
-        "limit": limit
-    }
+        "limit": limit,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "hash": hash,
+        "full_name": full_name,
+        "id": id,
+        "signer_address": signer_address,
+        "order": order
+    })
     
-    # Add filter parameters if provided
-    if block_number is not None:
-        params["block_number"] = block_number
-        
-    if block_start is not None:
-        params["block_start"] = block_start
-        
-    if block_end is not None:
-        params["block_end"] = block_end
-        
-    if timestamp_start is not None:
-        params["timestamp_start"] = timestamp_start
-        
-    if timestamp_end is not None:
-        params["timestamp_end"] = timestamp_end
-        
-    if hash is not None:
-        params["hash"] = hash
-        
-    if full_name is not None:
-        params["full_name"] = full_name
-        
-    if id is not None:
-        params["id"] = id
-        
-    if signer_address is not None:
-        params["signer_address"] = signer_address
-        
-    if order is not None:
-        params["order"] = order
+    # Make API request for extrinsics list, prefetching the next page of a full page
+    return await _fetch_pages("extrinsic", params, [page],
+                              validate=partial(validate_list_response, adapter=ExtrinsicsListAdapter))
+
+async def iter_extrinsics(block_start, block_end, chunk=100, limit=200, batch=3, **filters):
+    """Iterate over the extrinsics of a block range, fetching chunks of blocks concurrently.
+
+    Args:
+        block_start: Start of block range (inclusive)
+        block_end: End of block range (inclusive)
+        chunk: Number of blocks per request
+        limit: Number of entries per page (defaults to 200, the maximum)
+        batch: Number of chunks fetched concurrently
+        **filters: Other extrinsic parameters (full_name, signer_address, order, ...)
+
+    Yields:
+        Validated extrinsics, chunk by chunk in block order
+
+    Raises:
+        IncompleteResultError: If a chunk could not be fetched, the extrinsics before it have been yielded
+    """
+    check_query_params(1, limit, block_start, block_end)
     
-    # Make API request for extrinsics list
-    response_data = make_api_request("extrinsic", params)
-    return validate_response(response_data, ExtrinsicsListData)
+    # The parameters shared by all requests are set up once, the range and "page" are set per request
+    base_params = drop_none({"limit": limit, **filters})
+    validate = partial(validate_list_response, adapter=ExtrinsicsListAdapter)
+    starts = range(block_start, block_end + 1, chunk)
+    for i in range(0, len(starts), batch):
+        ranges = [(start, min(start + chunk - 1, block_end)) for start in starts[i:i + batch]]
+        responses = await make_api_batch_request(
+            [("extrinsic", {**base_params, "block_start": start, "block_end": end, "page": 1})
+             for start, end in ranges],
+            validate=validate
+        )
+        for (start, end), response in zip(ranges, responses):
+            page = 1
+            while True:
+                rows = response_rows(response)
+                # Stop at a rate limited or failed request, rather than skip the rest of the range
+                if rows is None:
+                    raise IncompleteResultError(
+                        f"Extrinsics of blocks {start}-{end} (page {page}) could not be fetched: "
+                        f"{response['error'] if response else 'API rate limit reached'}"
+                    )
+                for row in rows:
+                    yield row
+                # A chunk with more extrinsics than a page is paged through
+                if len(rows) < limit:
+                    break
+                page += 1
+                response = await make_api_request(
+                    "extrinsic", {**base_params, "block_start": start, "block_end": end, "page": page},
+                    validate=validate
+                )
 
 @mcp.tool(description='Retrieve blockchain event data with filtering options for block, type, timestamp, and related transactions')
-def get_events_data(block_number: Optional[int] = None,
+async def get_events_data(block_number: Optional[int] = None,
                    block_start: Optional[int] = None,
                    block_end: Optional[int] = None,
                    timestamp_start: Optional[int] = None,
@@ -660,71 +948,71 @@ def get_events_data(block_number: Optional[int] = None,
         order: Ordering of results (e.g., "block_number_desc")
     """
     # Validate input parameters
-    if limit <= 0 or limit > 200:
-        raise ValueError("Limit must be between 1 and 200")
-        
-    if page <= 0:
-        raise ValueError("Page must be positive")
-    
-    # Validate range parameters
-    if block_start is not None and block_end is not None and block_start > block_end:
-        raise ValueError("block_start must be less than or equal to block_end")
-        
-    if timestamp_start is not None and timestamp_end is not None and timestamp_start > timestamp_end:
-        raise ValueError("timestamp_start must be less than or equal to timestamp_end")
+    check_query_params(page, limit, block_start, block_end, timestamp_start, timestamp_end)
     
     # Set up parameters
-    params = {
+    params = drop_none({
         "page": page,
-        "limit": limit
-    }
-    
-    # Add filter parameters if provided
-    if block_number is not None:
-        params["block_number"] = block_number
-        
-    if block_start is not None:
-        params["block_start"] = block_start
-        
-    if block_end is not None:
-        params["block_end"] = block_end
-        
-    if timestamp_start is not None:
-        params["timestamp_start"] = timestamp_start
-        
-    if timestamp_end is not None:
-        params["timestamp_end"] = timestamp_end
-        
-    if pallet is not None:
-        params["pallet"] = pallet
-        
-    if phase is not None:
-        params["phase"] = phase
-        
-    if name is not None:
-        params["name"] = name
-        
-    if full_name is not None:
-        params["full_name"] = full_name
-        
-    if extrinsic_id is not None:
-        params["extrinsic_id"] = extrinsic_id
-        
-    if call_id is not None:
-        params["call_id"] = call_id
-        
-    if id is not None:
-        params["id"] = id
-        
-    if order is not None:
-        params["order"] = order
+        "limit": limit,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "pallet": pallet,
+        "phase": phase,
+        "name": name,
+        "full_name": full_name,
+        "extrinsic_id": extrinsic_id,
+        "call_id": call_id,
+        "id": id,
+        "order": order
+    })
     
+    # Make API request for events list, prefetching the next page of a full page
+    return await _fetch_pages("event", params, [page],
+                              validate=partial(validate_list_response, adapter=EventsListAdapter))
+
+async def iter_network_stats_history(frequency="by_day", limit=200, batch=3, **filters):
+    """Iterate over the network stats history, fetching a batch of pages at a time.
+
+    Args:
+        frequency: Data frequency (defaults to "by_day")
+        limit: Number of entries per page (defaults to 200, the maximum)
+        batch: Number of pages fetched concurrently
+        **filters: Other stats/history parameters (block_start, timestamp_end, order, ...)
+
+    Yields:
+        Validated stats entries, in page order, until a page is not full
 
-    response_data = make_api_request("event", params)
-    return validate_response(response_data, EventsListData)
+    Raises:
+        IncompleteResultError: If a page could not be fetched, the entries before it have been yielded
+    """
+    # The parameters shared by all pages are set up once, "page" is set per request
+    base_params = drop_none({"limit": limit, "frequency": frequency, **filters})
+    validate = partial(validate_list_response, adapter=NetworkStatsListAdapter)
+    page = 1
+    while True:
+        responses = await make_api_batch_request(
+            [("stats/history", {**base_params, "page": p}) for p in range(page, page + batch)], validate=validate
+        )
+        for p, response in enumerate(responses, page):
+            rows = response_rows(response)
+            # A rate limited or failed page is not the end of the history
+            if rows is None:
+                raise IncompleteResultError(
+                    f"Network stats history page {p} could not be fetched: "
+                    f"{response['error'] if response else 'API rate limit reached'}"
+                )
+            for row in rows:
+                yield row
+            # Stop at the last page
+            if len(rows) < limit:
+                return
+        page += batch
 
 @mcp.tool(description='Retrieve network statistics data including blockchain metrics, account numbers, and economic indicators')
-def get_network_stats(data_type: Literal["current", "history"] = "current",
+async def get_network_stats(data_type: Literal["current", "history"] = "current",
                      block_number: Optional[int] = None,
                      block_start: Optional[int] = None,
                      block_end: Optional[int] = None,
@@ -748,71 +1036,55 @@ def get_network_stats(data_type: Literal["current", "history"] = "current",
         limit: Number of entries to return (defaults to 50, max 200, for history)
         order: Ordering of results (e.g., "block_number_desc", for history)
     """
+    # Handle current stats request, the history parameters don't apply to it
+    if data_type == "current":
+        return await make_api_request("stats/latest",
+                                      validate=partial(validate_first_item, model_class=NetworkStatsData))
+    
     # Validate input parameters
-    if data_type not in ["current", "history"]:
+    if data_type != "history":
         raise ValueError(f"Invalid data_type: {data_type}")
-        
-    if data_type == "history":
-        if limit <= 0 or limit > 200:
-            raise ValueError("Limit must be between 1 and 200")
-            
-        if page <= 0:
-            raise ValueError("Page must be positive")
-        
-        # Validate range parameters
-        if block_start is not None and block_end is not None and block_start > block_end:
-            raise ValueError("block_start must be less than or equal to block_end")
-            
-        if timestamp_start is not None and timestamp_end is not None and timestamp_start > timestamp_end:
-            raise ValueError("timestamp_start must be less than or equal to timestamp_end")
-    
-    # Handle current stats request
-    if data_type == "current":
-        response_data = make_api_request("stats/latest")
-        if isinstance(response_data, dict) and "data" in response_data and response_data["data"]:
-            return validate_response(response_data["data"][0], NetworkStatsData)
-        return response_data
+    
+    check_query_params(page, limit, block_start, block_end, timestamp_start, timestamp_end)
     
     # Handle historical stats request
-    else:
-        # Set up parameters
-        params = {
-            "page": page,
-            "limit": limit,
-            "frequency": frequency
-        }
-        
-        # Add filter parameters if provided
-        if block_number is not None:
-            params["block_number"] = block_number
-            
-        if block_start is not None:
-            params["block_start"] = block_start
-            
-        if block_end is not None:
-            params["block_end"] = block_end
-            
-        if timestamp_start is not None:
-            params["timestamp_start"] = timestamp_start
-            
-        if timestamp_end is not None:
-            params["timestamp_end"] = timestamp_end
-            
-        if order is not None:
-            params["order"] = order
-        
-        # Make API request for stats history
-        response_data = make_api_request("stats/history", params)
-        return validate_response(response_data, NetworkStatsListData)
+    params = drop_none({
+        "page": page,
+        "limit": limit,
+        "frequency": frequency,
+        "block_number": block_number,
+        "block_start": block_start,
+        "block_end": block_end,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end,
+        "order": order
+    })
+    
+    # Make API request for stats history
+    return await make_api_request("stats/history", params,
+                                  validate=partial(validate_list_response, adapter=NetworkStatsListAdapter))
+
+# Endpoint for each get_subnet_distribution data_type
+_SUBNET_DISTRIBUTION_ENDPOINTS = {
+    "coldkey_distribution": "subnet/distribution/coldkey",
+    "ip_distribution": "subnet/distribution/ip",
+    "miner_incentive": "subnet/distribution/incentive"
+}
+
+SubnetDistributionType = Literal["coldkey_distribution", "ip_distribution", "miner_incentive"]
 
 @mcp.tool(description='Get distribution statistics about subnets including coldkey distribution and IP distribution')
-def get_subnet_distribution(netuid: int = 1,
-                          data_type: Literal["coldkey_distribution", "ip_distribution", "miner_incentive"] = "coldkey_distribution") -> Dict:
+async def get_subnet_distribution(netuid: int = 1,
+                          data_type: SubnetDistributionType | List[SubnetDistributionType] = "coldkey_distribution") -> Dict:
     """Get distribution statistics for a specific subnet
     
     Args:
         netuid: Subnet ID (required)
-        data_type: Type of distribution to query ("coldkey_distribution", "ip_distribution", or "miner_incentive")
+        data_type: Type of distribution to query ("coldkey_distribution", "ip_distribution", or "miner_incentive"),
+            or a list of them to query all at once
+    
+    Returns:
+        The distribution data, or for a list of types a dict of the distribution data by type
     """
     # Validate netuid
     if netuid < 0:
@@ -823,23 +1095,28 @@ def get_subnet_distribution(netuid: int = 1,
         "netuid": netuid
     }
     
-    # Make API request based on data_type
-    if data_type == "coldkey_distribution":
-        response_data = make_api_request("subnet/distribution/coldkey", params, version="v1")
-        return response_data
+    data_types = [data_type] if isinstance(data_type, str) else list(data_type)
+    for requested_type in data_types:
+        if requested_type not in _SUBNET_DISTRIBUTION_ENDPOINTS:
+            raise ValueError(f"Invalid data_type: {requested_type}")
     
-    elif data_type == "ip_distribution":
-        response_data = make_api_request("subnet/distribution/ip", params, version="v1")
-        return response_data
+    if isinstance(data_type, str):
+        return await make_api_request(_SUBNET_DISTRIBUTION_ENDPOINTS[data_type], params, version="v1")
     
-    elif data_type == "miner_incentive":
-        response_data = make_api_request("subnet/distribution/incentive", params, version="v1")
-        return response_data
-    
-    else:
-        raise ValueError(f"Invalid data_type: {data_type}")
+    # The API has no combined endpoint, so the distributions are fetched concurrently
+    responses = await make_api_batch_request(
+        [(_SUBNET_DISTRIBUTION_ENDPOINTS[requested_type], params) for requested_type in data_types]
+    )
+    return dict(zip(data_types, responses))
 
 
 if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport='stdio')
+    try:
+        import uvloop
+    except ImportError:
+        # Initialize and run the server
+        mcp.run(transport='stdio')
+    else:
+        # uvloop is optional, it speeds up the event loop the server runs on.
+        # This is what mcp.run(transport='stdio') runs, on a uvloop event loop
+        uvloop.run(mcp.run_stdio_async())
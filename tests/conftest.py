@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add src to path once for all test modules
+src_path = Path(__file__).parent.parent / "src"
+sys.path.append(str(src_path))
+
+from cache_service import TaoStatsCacheService
+
+# The server module is imported as "server" by test_server and as "src.server" by test_tools
+SERVER_MODULES = ("server", "src.server")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """Serve API requests from a handler, through the real client code path.
+
+    Returns a function installing a handler, with a client on an
+    httpx.MockTransport and a fresh non-persistent cache, which returns the
+    list of requests sent. The handler may also be a dict of canned JSON
+    responses by URL path.
+    """
+    def install(handler):
+        requests = []
+        
+        if isinstance(handler, dict):
+            routes = handler
+            handler = lambda request: httpx.Response(200, json=routes[request.url.path])
+        
+        def record(request):
+            requests.append(request)
+            return handler(request)
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        cache = TaoStatsCacheService({'persistent_cache_enabled': False})
+        for name in SERVER_MODULES:
+            module = sys.modules.get(name)
+            if module is not None:
+                monkeypatch.setattr(module, "_CLIENT", client)
+                monkeypatch.setattr(module, "tao_stats_cache", cache)
+        return requests
+    
+    return install
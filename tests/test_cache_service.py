@@ -0,0 +1,377 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+import cache_service
+from cache_service import SyncTaoStatsCacheService, TaoStatsCacheService
+
+
+def make_service(tmp_path, **options):
+    """Create a cache service persisting to a temporary directory."""
+    return SyncTaoStatsCacheService({
+        'cache_path': str(tmp_path / 'tao-cache.jsonl'),
+        'minute_request_limit': 100,
+        'flush_interval': 0,
+        **options
+    })
+
+class TestCachePersistence:
+    """Tests for the append-only cache log."""
+
+    def test_entries_survive_reload(self, tmp_path):
+        """Test that cached results are restored by a new service instance."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key2", lambda: {"data": [2]})
+
+        reloaded = make_service(tmp_path)
+
+        assert reloaded.with_cache("key1", lambda: {"data": "refetched"}) == {"data": [1]}
+        assert reloaded.with_cache("key2", lambda: {"data": "refetched"}) == {"data": [2]}
+
+    def test_each_result_is_appended(self, tmp_path):
+        """Test that every new result appends exactly one record to the log."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key2", lambda: {"data": [2]})
+
+        lines = (tmp_path / 'tao-cache.jsonl').read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])[0] == "key1"
+        assert json.loads(lines[1])[0] == "key2"
+
+    def test_last_write_wins(self, tmp_path):
+        """Test that the latest record for a key is the one restored."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": "old"})
+        service.with_cache("key1", lambda: {"data": "new"}, {'force_refresh': True})
+
+        reloaded = make_service(tmp_path)
+
+        assert reloaded.cache["key1"].data == {"data": "new"}
+
+    def test_unchanged_result_is_not_rewritten(self, tmp_path):
+        """Test that refetching identical data only logs the new expiry."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key1", lambda: {"data": [1]}, {'force_refresh': True, 'ttl': 120000})
+
+        lines = (tmp_path / 'tao-cache.jsonl').read_text().splitlines()
+        reloaded = make_service(tmp_path)
+
+        assert len(json.loads(lines[1])) == 3
+        assert reloaded.cache["key1"].data == {"data": [1]}
+        assert reloaded.cache["key1"].expires_at == service.cache["key1"].expires_at
+
+    def test_invalidated_entries_are_not_restored(self, tmp_path):
+        """Test that invalidation is recorded in the log."""
+        service = make_service(tmp_path)
+        service.with_cache("price/1", lambda: 1)
+        service.with_cache("price/2", lambda: 2)
+        service.with_cache("block/1", lambda: 3)
+        service.invalidate("block/1")
+        assert service.invalidate_by_prefix("price/") == 2
+
+        reloaded = make_service(tmp_path)
+
+        assert reloaded.cache == {}
+
+    def test_torn_last_line_is_skipped(self, tmp_path):
+        """Test that a partially written record does not discard the cache."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+        with open(tmp_path / 'tao-cache.jsonl', 'a', encoding='utf-8') as f:
+            f.write('["key2", {"data"')
+
+        reloaded = make_service(tmp_path)
+
+        assert list(reloaded.cache) == ["key1"]
+
+    def test_removed_cache_dir_is_recreated(self, tmp_path):
+        """Test that the log is still written if its directory was removed."""
+        service = make_service(tmp_path / "cache")
+        (tmp_path / "cache").rmdir()
+        service.with_cache("key1", lambda: {"data": [1]})
+
+        assert make_service(tmp_path / "cache").cache["key1"].data == {"data": [1]}
+
+    def test_records_are_buffered_until_flush(self, tmp_path):
+        """Test that results are written in batches when a flush interval is set."""
+        service = make_service(tmp_path, flush_interval=3600)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key2", lambda: {"data": [2]})
+
+        assert not (tmp_path / 'tao-cache.jsonl').exists()
+
+        service.flush()
+
+        assert len((tmp_path / 'tao-cache.jsonl').read_text().splitlines()) == 2
+        assert list(make_service(tmp_path).cache) == ["key1", "key2"]
+
+    def test_close_stops_the_flusher(self, tmp_path):
+        """Test that closing the cache stops the flusher and writes pending records."""
+        service = make_service(tmp_path, flush_interval=3600)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.close()
+
+        assert not service._flusher.is_alive()
+        assert make_service(tmp_path).cache["key1"].data == {"data": [1]}
+
+    def test_no_flusher_without_persistence(self, tmp_path):
+        """Test that a non-persistent cache starts no flusher thread."""
+        service = make_service(tmp_path, persistent_cache_enabled=False, flush_interval=3600)
+
+        assert service._flusher is None
+        service.close()
+        assert not (tmp_path / 'tao-cache.jsonl').exists()
+
+    def test_compaction_rewrites_live_entries(self, tmp_path):
+        """Test that compaction drops superseded records."""
+        service = make_service(tmp_path)
+        for i in range(10):
+            service.with_cache("key1", lambda i=i: i, {'force_refresh': True})
+        service._compact()
+
+        lines = (tmp_path / 'tao-cache.jsonl').read_text().splitlines()
+        assert len(lines) == 2  # header + one entry
+        assert make_service(tmp_path).cache["key1"].data == 9
+
+    def test_failed_compaction_keeps_the_log(self, tmp_path, monkeypatch):
+        """Test that an interrupted compaction leaves the previous log intact."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+
+        def fail(record, binary):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache_service, "_encode_record", fail)
+        service._compact()
+        monkeypatch.undo()
+
+        assert not (tmp_path / 'tao-cache.jsonl.tmp').exists()
+        assert make_service(tmp_path).cache["key1"].data == {"data": [1]}
+
+    def test_stdlib_json_fallback(self, tmp_path, monkeypatch):
+        """Test that the log is readable and writable without orjson."""
+        service = make_service(tmp_path)
+        service.with_cache("key1", lambda: {"data": [1]})
+
+        monkeypatch.setattr(cache_service, "orjson", None)
+        reloaded = make_service(tmp_path)
+        reloaded.with_cache("key2", lambda: {"data": [2]})
+
+        assert make_service(tmp_path).cache["key2"].data == {"data": [2]}
+        assert reloaded.cache["key1"].data == {"data": [1]}
+
+    def test_binary_log_survives_reload(self, tmp_path):
+        """Test that the msgpack log round-trips entries and removals."""
+        pytest.importorskip("msgpack")
+        options = {'cache_path': str(tmp_path / 'tao-cache.msgpack')}
+        service = make_service(tmp_path, **options)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key2", lambda: {"data": [2]})
+        service.invalidate("key2")
+
+        reloaded = make_service(tmp_path, **options)
+
+        assert service._binary_log
+        assert list(reloaded.cache) == ["key1"]
+        assert reloaded.cache["key1"].data == {"data": [1]}
+
+    @pytest.mark.parametrize("cache_file", ["tao-cache.jsonl", "tao-cache.msgpack"])
+    def test_entries_are_decoded_on_first_access(self, tmp_path, cache_file):
+        """Test that restored data stays encoded until it is used."""
+        if cache_file.endswith(".msgpack"):
+            pytest.importorskip("msgpack")
+        options = {'cache_path': str(tmp_path / cache_file)}
+        service = make_service(tmp_path, **options)
+        service.with_cache("key1", lambda: {"data": [1]})
+        service.with_cache("key2", lambda: {"data": [2]})
+
+        reloaded = make_service(tmp_path, **options)
+        reloaded._compact()
+
+        assert reloaded.cache["key1"].encoded_data(reloaded._binary_log) is not None
+        assert reloaded.with_cache("key1", lambda: "refetched") == {"data": [1]}
+        assert reloaded.cache["key1"].encoded_data(reloaded._binary_log) is None
+        assert make_service(tmp_path, **options).with_cache("key2", lambda: "refetched") == {"data": [2]}
+
+    def test_unreadable_entry_is_refetched(self, tmp_path):
+        """Test that an entry whose data cannot be decoded is treated as a miss."""
+        now = int(time.time() * 1000)
+        (tmp_path / 'tao-cache.jsonl').write_text(f'["key1",{{"data":,{now},{now + 60000}]\n')
+
+        service = make_service(tmp_path)
+
+        assert service.with_cache("key1", lambda: "refetched") == "refetched"
+
+    def test_legacy_cache_is_imported(self, tmp_path):
+        """Test that a cache file in the legacy JSON format is imported once."""
+        now = int(time.time() * 1000)
+        legacy = {
+            "timestamp": now,
+            "requestTimestamps": [],
+            "entries": [
+                ["live", {"data": {"data": [1]}, "timestamp": now, "expiresAt": now + 60000}],
+                ["expired", {"data": {"data": [2]}, "timestamp": now - 2, "expiresAt": now - 1}]
+            ]
+        }
+        (tmp_path / 'tao-cache.json').write_text(json.dumps(legacy, indent=2))
+
+        service = make_service(tmp_path)
+
+        assert list(service.cache) == ["live"]
+        assert (tmp_path / 'tao-cache.jsonl').exists()
+        assert list(make_service(tmp_path).cache) == ["live"]
+
+class TestAsyncCache:
+    """Tests for the async cache service."""
+
+    def test_concurrent_lookups_share_one_fetch(self, tmp_path):
+        """Test that concurrent lookups for a key wait for the same request."""
+        service = TaoStatsCacheService({
+            'cache_path': str(tmp_path / 'tao-cache.jsonl'),
+            'minute_request_limit': 100,
+            'flush_interval': 0
+        })
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"data": [1]}
+
+        async def lookup_twice():
+            return await asyncio.gather(service.with_cache("key1", fetch), service.with_cache("key1", fetch))
+
+        assert asyncio.run(lookup_twice()) == [{"data": [1]}, {"data": [1]}]
+        assert len(calls) == 1
+        assert service.pending_requests == {}
+
+class TestCacheEviction:
+    """Tests for the bounded in-memory cache."""
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path):
+        """Test that the entry used least recently is evicted first."""
+        service = make_service(tmp_path, max_cache_size=2)
+        service.with_cache("key1", lambda: 1)
+        service.with_cache("key2", lambda: 2)
+        service.with_cache("key1", lambda: "refetched")
+        service.with_cache("key3", lambda: 3)
+
+        assert list(service.cache) == ["key1", "key3"]
+
+    def test_reload_respects_max_cache_size(self, tmp_path):
+        """Test that only the most recent entries are restored."""
+        service = make_service(tmp_path)
+        for i in range(5):
+            service.with_cache(f"key{i}", lambda i=i: i)
+
+        reloaded = make_service(tmp_path, max_cache_size=3)
+
+        assert list(reloaded.cache) == ["key2", "key3", "key4"]
+
+    def test_sweep_removes_only_expired_entries(self, tmp_path):
+        """Test that sweeping drops expired entries, honouring refreshes."""
+        service = make_service(tmp_path)
+        service.with_cache("short", lambda: 1, {'ttl': 1000})
+        service.with_cache("long", lambda: 2, {'ttl': 60000})
+        service.with_cache("refreshed", lambda: 3, {'ttl': 1000})
+        service.with_cache("refreshed", lambda: 4, {'ttl': 60000, 'force_refresh': True})
+
+        assert service.sweep_expired(service.cache["long"].timestamp + 2000) == 1
+        assert list(service.cache) == ["long", "refreshed"]
+
+class TestRateLimit:
+    """Tests for the per-minute request window."""
+
+    def test_limit_reached_after_window_fills(self, tmp_path):
+        """Test that the limit is reached once the window is full."""
+        service = make_service(tmp_path, minute_request_limit=2)
+        now = 1_000_000
+        service._record_request(now)
+        assert not service._has_reached_rate_limit(now)
+        service._record_request(now + 10)
+        assert service._has_reached_rate_limit(now + 20)
+
+    def test_expired_requests_leave_the_window(self, tmp_path):
+        """Test that requests older than the window are dropped."""
+        service = make_service(tmp_path, minute_request_limit=2)
+        now = 1_000_000
+        service._record_request(now)
+        service._record_request(now + 30_000)
+
+        assert not service._has_reached_rate_limit(now + 60_000)
+        assert list(service.rate_limiter.timestamps) == [now + 30_000]
+
+    def test_wait_time_until_oldest_request_expires(self, tmp_path):
+        """Test that the wait time is measured from the oldest request."""
+        service = make_service(tmp_path, minute_request_limit=2)
+        now = 1_000_000
+        service._record_request(now)
+        service._record_request(now + 30_000)
+
+        assert service._get_wait_time_ms(now + 40_000) == 20_000
+
+    def test_record_retry_until_limit(self, tmp_path):
+        """Test that retries are recorded until the limit is reached."""
+        service = make_service(tmp_path, minute_request_limit=2)
+        now = 1_000_000
+        assert service.record_retry(now)
+        assert service.record_retry(now + 10)
+        assert not service.record_retry(now + 20)
+        assert service._request_count(now + 20) == 2
+
+    def test_rate_limited_lookup_fails_silently(self, tmp_path):
+        """Test that a rate-limited miss returns None with fail_silently."""
+        service = make_service(tmp_path, minute_request_limit=1)
+        service.with_cache("key1", lambda: 1)
+
+        assert service.with_cache("key2", lambda: 2, {'fail_silently': True}) is None
+        with pytest.raises(Exception, match="rate limit reached"):
+            service.with_cache("key3", lambda: 3)
+
+    def test_request_window_is_persisted_in_wall_clock_time(self, tmp_path):
+        """Test that request times are converted between clocks when persisted."""
+        service = make_service(tmp_path, minute_request_limit=1)
+        service.with_cache("key1", lambda: 1)
+        service._compact()
+
+        header = json.loads((tmp_path / 'tao-cache.jsonl').read_text().splitlines()[0])
+        reloaded = make_service(tmp_path, minute_request_limit=1)
+
+        assert abs(header["requestTimestamps"][0] - time.time() * 1000) < 5000
+        # The clock offset is read separately on save and load
+        assert abs(reloaded.rate_limiter.timestamps[0] - service.rate_limiter.timestamps[0]) <= 2
+        assert reloaded._has_reached_rate_limit()
+
+    def test_sliding_counter_estimates_previous_window(self, tmp_path):
+        """Test that the counter weights the previous window by its overlap."""
+        service = make_service(tmp_path, minute_request_limit=2, rate_limit_strategy='sliding_counter')
+        start = 60_000 * 100
+        service._record_request(start + 50_000)
+        service._record_request(start + 55_000)
+
+        # Half of the previous window still overlaps: 2 * 0.5 = 1 request
+        assert service._request_count(start + 90_000) == 1
+        assert not service._has_reached_rate_limit(start + 90_000)
+        assert service._has_reached_rate_limit(start + 60_000)
+        assert service._get_wait_time_ms(start + 60_000) == 30_000
+
+    def test_sliding_counter_state_survives_reload(self, tmp_path):
+        """Test that the counter state is persisted in the log header."""
+        service = make_service(tmp_path, minute_request_limit=2, rate_limit_strategy='sliding_counter')
+        service.with_cache("key1", lambda: 1)
+        service.with_cache("key2", lambda: 2)
+        service._compact()
+
+        reloaded = make_service(tmp_path, minute_request_limit=2, rate_limit_strategy='sliding_counter')
+
+        assert reloaded._has_reached_rate_limit()
+
+    def test_unknown_strategy_is_rejected(self, tmp_path):
+        """Test that an unknown rate limit strategy raises an error."""
+        with pytest.raises(ValueError, match="Unknown rate limit strategy"):
+            make_service(tmp_path, rate_limit_strategy='token_bucket')
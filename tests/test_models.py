@@ -0,0 +1,240 @@
+from array import array
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from models import (AccountAddress, ContractData, EVMAddressData, EventData, PriceData,
+                    ProxyCallData, TradingViewData, TransfersListAdapter, ValidatorData,
+                    PRICE_OHLC_COLUMNS, parse_many, parse_many_json, to_columns)
+
+SS58_ADDRESS = "5Hd2ze5ug8n1bo3UCAcQsf66VNjKqGos8u6apNfzcU86pg4N"
+HEX_ADDRESS = "0xf5d5714c084c112843aca74f8c498da06cc5a2d63153b825189baa51043b1f0b"
+
+
+class TestAddressValidation:
+    """Tests for the address format validators."""
+
+    def test_valid_ss58_address(self):
+        """Test that a well-formed SS58 address is accepted."""
+        address = AccountAddress(ss58=SS58_ADDRESS, hex=HEX_ADDRESS)
+        assert address.ss58 == SS58_ADDRESS
+
+    @pytest.mark.parametrize("ss58", [
+        "5Hd2ze",  # too short
+        SS58_ADDRESS + "x",  # too long
+        "5Hd2ze5ug8n1bo3UCAcQsf66VNjKqGos8u6apNfzcU86pg40",  # 0 is not base58
+        "1Hd2ze5ug8n1bo3UCAcQsf66VNjKqGos8u6apNfzcU86pg4N"  # wrong prefix
+    ])
+    def test_invalid_ss58_address(self, ss58):
+        """Test that malformed SS58 addresses are rejected."""
+        with pytest.raises(ValidationError, match="Invalid SS58 address format"):
+            AccountAddress(ss58=ss58, hex=HEX_ADDRESS)
+
+    def test_evm_address_must_be_hex(self):
+        """Test that EVM addresses with non-hex characters are rejected."""
+        valid = "0x" + "a" * 40
+        assert EVMAddressData(address=valid, balance="0", transactions=0).address == valid
+
+        with pytest.raises(ValidationError, match="Invalid Ethereum address format"):
+            EVMAddressData(address="0x" + "z" * 40, balance="0", transactions=0)
+
+
+    def test_hex_address_must_have_prefix(self):
+        """Test that hex addresses without a 0x prefix are rejected."""
+        with pytest.raises(ValidationError, match="Invalid hex address format"):
+            AccountAddress(ss58=SS58_ADDRESS, hex=HEX_ADDRESS[2:])
+
+    def test_validator_keys_must_be_ss58(self):
+        """Test that validator hotkeys and coldkeys share the SS58 check."""
+        validator = {"hotkey": SS58_ADDRESS, "coldkey": SS58_ADDRESS, "stake": "0", "total_stake": "0"}
+        assert ValidatorData(**validator).hotkey == SS58_ADDRESS
+
+        with pytest.raises(ValidationError, match="Invalid SS58 address format"):
+            ValidatorData(**{**validator, "coldkey": HEX_ADDRESS})
+
+
+    def test_trusted_context_skips_address_checks(self):
+        """Test that address format checks are skipped for trusted data."""
+        proxy_call = {
+            "hash": "0x1", "block_num": 1, "real": "5abc", "proxy": SS58_ADDRESS, "call_hash": "0x2",
+            "module": "Proxy", "call": "proxy", "args": {}, "success": True,
+            "timestamp": "2023-01-01T00:00:00Z"
+        }
+
+        with pytest.raises(ValidationError, match="Invalid SS58 address format"):
+            ProxyCallData.model_validate(proxy_call)
+        assert ProxyCallData.model_validate(proxy_call, context={"trusted": True}).real == "5abc"
+
+
+class TestResponseRows:
+    """Tests for the dataclass response rows."""
+
+    def test_unknown_fields_are_ignored(self):
+        """Test that rows ignore fields they do not declare."""
+        row = PriceData(symbol="TAO", price=1.5, volume=1000)
+
+        assert row.price == 1.5
+        assert not hasattr(row, "volume")
+        assert not hasattr(row, "__dict__")
+
+    def test_numeric_strings_are_parsed(self):
+        """Test that numeric fields sent as strings are parsed once."""
+        row = PriceData(symbol="TAO", price=1.5, percent_change_24h="-2.5", max_supply="21000000")
+
+        assert row.percent_change_24h == -2.5
+        assert row.max_supply == 21_000_000.0
+
+    def test_timestamps_are_parsed(self):
+        """Test that timestamp fields are parsed into aware datetimes."""
+        row = PriceData(symbol="TAO", price=1.5, last_updated="2023-01-01T00:00:00Z")
+
+        assert row.last_updated == datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+        with pytest.raises(ValidationError):
+            PriceData(symbol="TAO", price=1.5, last_updated="yesterday")
+
+    def test_negative_amount_is_rejected(self):
+        """Test that transfer amounts must be non-negative."""
+        address = {"ss58": SS58_ADDRESS, "hex": HEX_ADDRESS}
+        transfer = {
+            "id": "1", "to": address, "from": address, "network": "finney",
+            "block_number": 1, "timestamp": "2023-01-01T00:00:00Z", "amount": "-1",
+            "fee": "0", "transaction_hash": "0x1", "extrinsic_id": "1-1"
+        }
+
+        with pytest.raises(ValidationError, match="greater than or equal to 0"):
+            TransfersListAdapter.validate_python([transfer])
+
+    def test_addresses_are_shared_across_rows(self):
+        """Test that rows with the same address share one address instance."""
+        address = {"ss58": SS58_ADDRESS, "hex": HEX_ADDRESS}
+        transfer = {
+            "id": "1", "to": address, "from": dict(address), "network": "finney",
+            "block_number": 1, "timestamp": "2023-01-01T00:00:00Z", "amount": "1",
+            "fee": "0", "transaction_hash": "0x1", "extrinsic_id": "1-1"
+        }
+
+        first, second = TransfersListAdapter.validate_python([transfer, {**transfer, "id": "2"}])
+
+        assert first.to is first.from_ is second.to
+
+    def test_rows_dump_with_field_names(self):
+        """Test that aliased fields are populated by alias and dumped by name."""
+        address = {"ss58": SS58_ADDRESS, "hex": HEX_ADDRESS}
+        transfer = {
+            "id": "1", "to": address, "from": address, "network": "finney",
+            "block_number": 1, "timestamp": "2023-01-01T00:00:00Z", "amount": "1",
+            "fee": "0", "transaction_hash": "0x1", "extrinsic_id": "1-1"
+        }
+
+        rows = TransfersListAdapter.validate_python([transfer])
+        dumped = TransfersListAdapter.dump_python(rows)
+
+        assert dumped[0]["from_"] == address
+        assert "from" not in dumped[0]
+
+
+    def test_balances_are_parsed_as_integers(self):
+        """Test that wei balances sent as strings are parsed into exact integers."""
+        evm = EVMAddressData(address="0x" + "a" * 40, balance="123456789012345678901234567890", transactions=0)
+
+        assert evm.balance == 123456789012345678901234567890
+
+    def test_bytecode_is_stored_as_bytes(self):
+        """Test that hex bytecode is stored as bytes and serialized back to hex."""
+        contract = ContractData(address="0x1", bytecode="0x6080ff", transactions=[], balance="0",
+                                timestamp="2023-01-01T00:00:00Z")
+
+        assert contract.bytecode == b"\x60\x80\xff"
+        assert contract.model_dump(mode="json")["bytecode"] == "0x6080ff"
+
+        with pytest.raises(ValidationError, match="Invalid hex data"):
+            ContractData(address="0x1", bytecode="0xzz", transactions=[], balance="0",
+                         timestamp="2023-01-01T00:00:00Z")
+
+
+class TestTrustedConstruct:
+    """Tests for building rows from already validated data."""
+
+    EVENT = {
+        "id": "1-1", "extrinsic_index": 1, "index": 1, "phase": "ApplyExtrinsic",
+        "pallet": "Balances", "name": "Transfer", "full_name": "Balances.Transfer",
+        "args": {"amount": "1"}, "block_number": 1, "extrinsic_id": "1-1",
+        "timestamp": datetime(2023, 1, 1, tzinfo=timezone.utc)
+    }
+
+    def test_from_trusted_matches_validated_row(self):
+        """Test that a trusted row equals the validated one and defaults are filled."""
+        row = EventData.from_trusted(self.EVENT)
+
+        assert row == EventData(**self.EVENT)
+        assert row.call_id is None
+
+    def test_from_trusted_skips_validation(self):
+        """Test that trusted data is stored as is."""
+        row = EventData.from_trusted({**self.EVENT, "block_number": "not a number"})
+
+        assert row.block_number == "not a number"
+
+
+class TestTradingViewData:
+    """Tests for the packed chart series."""
+
+    def test_series_are_packed_and_dumped_as_lists(self):
+        """Test that series are stored as C arrays and serialized as lists."""
+        chart = TradingViewData(symbol="TAO", resolution="1D", c=[1, "2.5"], h=[], l=[], o=[],
+                                t=[1700000000], v=[3], s="ok")
+
+        assert chart.c == array("d", [1.0, 2.5])
+        assert chart.t.typecode == "q"
+        assert chart.model_dump(mode="json")["c"] == [1.0, 2.5]
+
+    def test_non_numeric_series_are_rejected(self):
+        """Test that series with non-numeric values are rejected."""
+        with pytest.raises(ValidationError):
+            TradingViewData(symbol="TAO", resolution="1D", c=["x"], h=[], l=[], o=[], t=[], v=[], s="ok")
+
+
+class TestToColumns:
+    """Tests for building numeric columns from raw rows."""
+
+    def test_to_columns(self):
+        """Test that numeric fields are gathered into typed arrays per column."""
+        raw = [
+            {"open": "1.5", "high": "2", "low": "1", "close": "1.75", "volume_24h": 10, "asset": "TAO"},
+            {"open": "1.75", "high": "3", "low": "1.5", "close": "2.5", "volume_24h": 20, "asset": "TAO"}
+        ]
+
+        columns = to_columns(raw, PRICE_OHLC_COLUMNS)
+
+        assert columns["close"] == array("d", [1.75, 2.5])
+        assert set(columns) == set(PRICE_OHLC_COLUMNS)
+
+    def test_to_columns_integer_columns(self):
+        """Test that integer columns are stored as 64 bit integers."""
+        columns = to_columns([{"block_number": "7"}], {"block_number": "q"})
+
+        assert columns["block_number"] == array("q", [7])
+
+
+class TestParseMany:
+    """Tests for the bulk parsing helpers."""
+
+    def test_parse_many(self):
+        """Test that a list of rows is validated into models."""
+        rows = parse_many(PriceData, [{"symbol": "TAO", "price": 1.5}, {"symbol": "TAO", "price": 2}])
+
+        assert [row.price for row in rows] == [1.5, 2.0]
+        assert all(isinstance(row, PriceData) for row in rows)
+
+    def test_parse_many_json(self):
+        """Test that a JSON array is validated straight from bytes."""
+        rows = parse_many_json(PriceData, b'[{"symbol": "TAO", "price": 1.5}]')
+
+        assert rows == [PriceData(symbol="TAO", price=1.5)]
+
+    def test_parse_many_json_rejects_invalid_rows(self):
+        """Test that invalid rows raise a validation error."""
+        with pytest.raises(ValidationError):
+            parse_many_json(PriceData, b'[{"symbol": "TAO", "price": -1}]')
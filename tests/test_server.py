@@ -1,14 +1,20 @@
+import asyncio
 import httpx
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
 
-# Add src to path
-src_path = Path(__file__).parent.parent / "src"
-sys.path.append(str(src_path))
+from server import (mcp, validate_response, validate_list_response, make_api_request, make_api_batch_request, api_url, retry_delay, cache_ttl_ms,
+                    make_cache_key, decode_json)
+from models import PriceData, PriceOHLCListAdapter
+from cache_service import TaoStatsCacheService
+
+
+def fake_response(payload):
+    """Build a lightweight stand-in for a successful httpx response with a JSON body."""
+    return SimpleNamespace(status_code=200, content=json.dumps(payload).encode(), raise_for_status=lambda: None)
 
-from server import mcp, validate_response, make_api_request
-from models import PriceData
 
 class TestMCPInstance:
     """Test MCP instance creation and configuration."""
@@ -84,21 +90,52 @@ class TestValidateResponse:
         result = validate_response(data, PriceData)
         assert result == data
 
+class TestValidateListResponse:
+    """Tests for the validate_list_response function."""
+    
+    def test_validate_list_items(self):
+        """Test validating the items of a list response."""
+        point = {
+            "period": "1d",
+            "timestamp": "2023-01-01T00:00:00Z",
+            "asset": "tao",
+            "volume_24h": "1000",
+            "open": "1",
+            "high": "2",
+            "low": "0.5",
+            "close": "1.5"
+        }
+        data = {"data": [point], "pagination": {"current_page": 1}}
+        
+        result = validate_list_response(data, PriceOHLCListAdapter)
+        
+        assert result == {"data": [point]}
+    
+    def test_validate_empty_list(self):
+        """Test that an empty list fails validation and returns original data."""
+        data = {"data": []}
+        
+        result = validate_list_response(data, PriceOHLCListAdapter)
+        assert result is data
+
+@pytest.mark.anyio
 class TestMakeApiRequest:
     """Tests for the make_api_request function."""
     
-    @patch('httpx.get')
-    def test_make_api_request_default(self, mock_get):
+    @patch('httpx.AsyncClient.get')
+    async def test_make_api_request_default(self, mock_get, monkeypatch):
         """Test make_api_request with default parameters."""
+        # Use a fresh cache, so a cache log left by an earlier run cannot serve the request
+        monkeypatch.setattr("server.tao_stats_cache", TaoStatsCacheService({'persistent_cache_enabled': False}))
+        
         # Configure the mock to return a successful response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": "test_data"}
+        mock_response = fake_response({"data": "test_data"})
         mock_get.return_value = mock_response
         
         # Call the function with endpoint and params
-        result = make_api_request("test_endpoint", params={"param1": "value1"})
+        result = await make_api_request("test_endpoint", params={"param1": "value1"})
         
-        # Check that httpx.get was called correctly
+        # Check that httpx.AsyncClient.get was called correctly
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
         assert "test_endpoint" in args[0]
@@ -108,22 +145,24 @@ class TestMakeApiRequest:
         # Check the result
         assert result == {"data": "test_data"}
     
-    @patch('httpx.get')
-    def test_make_api_request_custom_version(self, mock_get):
+    @patch('httpx.AsyncClient.get')
+    async def test_make_api_request_custom_version(self, mock_get, monkeypatch):
         """Test make_api_request with custom API version."""
+        # Use a fresh cache, so a cache log left by an earlier run cannot serve the request
+        monkeypatch.setattr("server.tao_stats_cache", TaoStatsCacheService({'persistent_cache_enabled': False}))
+        
         # Configure the mock to return a successful response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": "test_data"}
+        mock_response = fake_response({"data": "test_data"})
         mock_get.return_value = mock_response
         
         # Call the function with endpoint, params, and custom version
-        result = make_api_request(
+        result = await make_api_request(
             "test_endpoint", 
             params={"param1": "value1"}, 
             version="v1"
         )
         
-        # Check that httpx.get was called correctly
+        # Check that httpx.AsyncClient.get was called correctly
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
         assert "test_endpoint" in args[0]
@@ -132,22 +171,24 @@ class TestMakeApiRequest:
         # Check the result
         assert result == {"data": "test_data"}
     
-    @patch('httpx.get')
-    def test_make_api_request_with_endpoint_suffix(self, mock_get):
+    @patch('httpx.AsyncClient.get')
+    async def test_make_api_request_with_endpoint_suffix(self, mock_get, monkeypatch):
         """Test make_api_request with endpoint suffix."""
+        # Use a fresh cache, so a cache log left by an earlier run cannot serve the request
+        monkeypatch.setattr("server.tao_stats_cache", TaoStatsCacheService({'persistent_cache_enabled': False}))
+        
         # Configure the mock to return a successful response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": "test_data"}
+        mock_response = fake_response({"data": "test_data"})
         mock_get.return_value = mock_response
         
         # Call the function with endpoint, params, and endpoint_suffix
-        result = make_api_request(
+        result = await make_api_request(
             "test_endpoint", 
             params={"param1": "value1"}, 
             endpoint_suffix="latest"
         )
         
-        # Check that httpx.get was called correctly
+        # Check that httpx.AsyncClient.get was called correctly
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
         assert "https://api.taostats.io/api/test_endpoint/v1/latest" == args[0]
@@ -156,9 +197,82 @@ class TestMakeApiRequest:
         # Check the result
         assert result == {"data": "test_data"}
     
-    @patch('httpx.get')
-    def test_make_api_request_error_response(self, mock_get):
+    async def test_make_api_request_sends_request(self, mock_api):
+        """Test the request make_api_request sends to the API."""
+        requests = mock_api(lambda request: httpx.Response(200, json={"data": "test_data"}))
+        
+        result = await make_api_request("test_endpoint", params={"param1": "value1"})
+        
+        assert result == {"data": "test_data"}
+        assert len(requests) == 1
+        assert requests[0].url == "https://api.taostats.io/api/test_endpoint/v1?param1=value1"
+        assert "Authorization" in requests[0].headers
+    
+    async def test_make_api_batch_request(self, mock_api):
+        """Test that batched requests are all sent, with responses in request order."""
+        requests = mock_api(lambda request: httpx.Response(200, json={"data": [request.url.params["id"]]}))
+        
+        results = await make_api_batch_request([
+            ("extrinsic", {"id": "1"}),
+            ("event", {"id": "2"}),
+            ("extrinsic", {"id": "1"}),
+        ])
+        
+        assert results == [{"data": ["1"]}, {"data": ["2"]}, {"data": ["1"]}]
+        # The repeated request is fetched once
+        assert len(requests) == 2
+    
+    async def test_make_api_request_retries_transient_errors(self, mock_api):
+        """Test that 429/5xx responses are retried and 4xx are not."""
+        responses = [
+            httpx.Response(503),
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"data": [1]}),
+        ]
+        requests = mock_api(lambda request: responses.pop(0))
+        with patch('server.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            result = await make_api_request("retry_endpoint")
+        
+        assert result == {"data": [1]}
+        assert len(requests) == 3
+        # The second delay is the Retry-After of the 429
+        assert sleep.call_args_list[1].args == (2.0,)
+        
+        requests = mock_api(lambda request: httpx.Response(404))
+        result = await make_api_request("retry_endpoint")
+        
+        assert result == {"data": [], "error": "HTTP 404"}
+        assert len(requests) == 1
+    
+    async def test_make_api_request_retries_count_against_rate_limit(self, mock_api, monkeypatch):
+        """Test that retries are recorded by the rate limiter and stop once it is reached."""
+        requests = mock_api(lambda request: httpx.Response(503))
+        cache = TaoStatsCacheService({'persistent_cache_enabled': False, 'minute_request_limit': 3})
+        monkeypatch.setattr("server.tao_stats_cache", cache)
+        with patch('server.asyncio.sleep', new_callable=AsyncMock):
+            result = await make_api_request("rate_limited_retry_endpoint")
+        
+        assert result == {"data": [], "error": "HTTP 503"}
+        # The first request and two retries fill the window of 3
+        assert len(requests) == 3
+        assert cache._has_reached_rate_limit()
+    
+    async def test_make_api_request_long_retry_after_is_not_retried(self, mock_api):
+        """Test that a 429 asking for a longer wait than MAX_RETRY_AFTER fails without retrying."""
+        requests = mock_api(lambda request: httpx.Response(429, headers={"Retry-After": "120"}))
+        with patch('server.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            result = await make_api_request("long_retry_after_endpoint")
+        
+        assert result == {"data": [], "error": "HTTP 429"}
+        assert len(requests) == 1
+        sleep.assert_not_called()
+    
+    @patch('httpx.AsyncClient.get')
+    async def test_make_api_request_error_response(self, mock_get, monkeypatch):
         """Test make_api_request with error response."""
+        # Use a fresh cache, so a cache log left by an earlier run cannot serve the request
+        monkeypatch.setattr("server.tao_stats_cache", TaoStatsCacheService({'persistent_cache_enabled': False}))
+        
         # Create proper mock request and response objects
         mock_request = MagicMock()
         mock_request.url = "https://api.taostats.io/api/v1/test_endpoint"
@@ -177,7 +291,106 @@ class TestMakeApiRequest:
         mock_get.return_value = mock_response
         
         # Call the function and expect it to return empty data instead of raising an error
-        result = make_api_request("test_endpoint", params={"param1": "value1"})
+        result = await make_api_request("test_endpoint", params={"param1": "value1"})
+        
+        # Check that we got an empty data response with the error, not an exception
+        assert result == {"data": [], "error": "HTTP 404"}
+    
+    async def test_make_api_request_caches_validated_data(self, mock_api):
+        """Test that validated responses are cached so cache hits skip validation."""
+        requests = mock_api(lambda request: httpx.Response(200, json={"data": "raw_data"}))
+        validate = MagicMock(return_value={"data": "validated_data"})
+        
+        first = await make_api_request("validated_endpoint", params={"param1": "value1"}, validate=validate)
+        second = await make_api_request("validated_endpoint", params={"param1": "value1"}, validate=validate)
+        
+        assert first == second == {"data": "validated_data"}
+        assert len(requests) == 1
+        validate.assert_called_once_with({"data": "raw_data"})
+
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Test that concurrent cache misses for the same request make one API call."""
+        mock_response = fake_response({"data": "test_data"})
+        
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+        
+        # Use a fresh cache so earlier tests' requests do not count against the rate limit
+        cache = TaoStatsCacheService({'persistent_cache_enabled': False})
+        with patch("server.tao_stats_cache", cache), \
+                patch('httpx.AsyncClient.get', side_effect=slow_get) as mock_get:
+            results = await asyncio.gather(
+                *(make_api_request("single_flight_endpoint", params={"param1": "value1"}) for _ in range(5))
+            )
+        
+        assert results == [{"data": "test_data"}] * 5
+        mock_get.assert_called_once()
+
+class TestDecodeJson:
+    """Tests for decoding response bodies."""
+    
+    def test_decode_json(self):
+        """Test decoding a response body."""
+        assert decode_json(b'{"data": [1, 2]}') == {"data": [1, 2]}
+    
+    def test_decode_json_stdlib_fallback(self, monkeypatch):
+        """Test that bodies are decoded with the stdlib when orjson is missing."""
+        monkeypatch.setattr("server.orjson", None)
+        
+        assert decode_json(b'{"data": [1, 2]}') == {"data": [1, 2]}
+
+class TestMakeCacheKey:
+    """Tests for the request cache keys."""
+    
+    def test_cache_key_ignores_param_order(self):
+        """Test that the same params in a different order give the same key."""
+        url = "https://api.taostats.io/api/transfer/v1"
+        
+        assert make_cache_key(url, {"page": 1, "limit": 50}) == make_cache_key(url, {"limit": 50, "page": 1})
+        assert make_cache_key(url, {"page": 1, "limit": 50}) == f"{url}?limit=50&page=1"
+    
+    def test_cache_key_skips_unset_params(self):
+        """Test that params set to None do not change the key."""
+        url = "https://api.taostats.io/api/transfer/v1"
         
-        # Check that we got an empty data response, not an exception
-        assert result == {"data": []} 
\ No newline at end of file
+        assert make_cache_key(url, {"page": 1, "order": None}) == make_cache_key(url, {"page": 1})
+        assert make_cache_key(url) == url
+
+class TestRetryDelay:
+    """Tests for the delay before retrying a request."""
+    
+    def test_retry_delay_backoff(self):
+        """Test that delays grow exponentially up to the cap."""
+        response = httpx.Response(503)
+        assert 0.1 <= retry_delay(response, 0) < 0.2
+        assert 0.4 <= retry_delay(response, 2) < 0.5
+        assert 5.0 <= retry_delay(response, 10) < 5.1
+    
+    def test_retry_delay_retry_after(self):
+        """Test that Retry-After in seconds is honored, up to a limit."""
+        assert retry_delay(httpx.Response(429, headers={"Retry-After": "3"}), 0) == 3.0
+        # Longer waits are not retried
+        assert retry_delay(httpx.Response(429, headers={"Retry-After": "3600"}), 0) is None
+        # HTTP dates fall back to the backoff
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert retry_delay(httpx.Response(429, headers={"Retry-After": date}), 0) < 0.2
+
+class TestApiUrl:
+    """Tests for request URL construction."""
+    
+    def test_api_url_formats(self):
+        """Test the v1, legacy dtao and DTAO API URL formats."""
+        assert api_url("block") == "https://api.taostats.io/api/block/v1"
+        assert api_url("block", "v2") == "https://api.taostats.io/api/block/v2"
+        assert api_url("dtao/pool") == "https://api.taostats.io/api/dtao/pool"
+        assert api_url("pool", use_dtao=True) == "https://api.taostats.io/api/dtao/pool"
+
+class TestCacheTtl:
+    """Tests for the per-endpoint cache TTL."""
+    
+    def test_cache_ttl_by_endpoint(self):
+        """Test that endpoints get the TTL of their data category."""
+        assert cache_ttl_ms("price/history") == 24 * 60 * 60 * 1000
+        assert cache_ttl_ms("subnet/distribution/ip") == 60 * 60 * 1000
+        assert cache_ttl_ms("transfer") == 5 * 60 * 1000